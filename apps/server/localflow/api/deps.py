@@ -1,6 +1,6 @@
 from fastapi import Depends, Request
 from sqlalchemy.orm import Session
-from ..storage.db import SessionLocal
+from ..storage.db import AsyncSessionLocal, SessionLocal
 from ..llm.provider import LLMProvider
 from ..tools.registry import ToolRegistry
 from ..rag.service import RagService
@@ -12,6 +12,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def get_llm(request: Request) -> LLMProvider:
     return request.app.state.llm_provider
 
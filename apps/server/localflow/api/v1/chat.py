@@ -1,20 +1,94 @@
+import asyncio
 import re
+import time
+import uuid
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import quote_plus, urlparse
+from urllib.parse import quote_plus
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..deps import get_db, get_llm, get_rag
+from ..deps import get_async_db, get_llm, get_rag
 from ..schemas import ErrorOut
-from .schemas import ChatIn, ChatOut
+from .schemas import ChatIn, ChatOut, DraftOut
+from ...core.config import settings
 from ...domain.enums import DraftStatus
+from ...domain.summaries import derive_title, preview
 from ...rag.service import RagService
 from ...services.approval_service import ApprovalService
 from ...storage.models import Conversation, Draft, Message
 
 router = APIRouter()
+_HISTORY_LIMIT = 24  # matches the providers' _MAX_HISTORY_MESSAGES window
 _URL_RE = re.compile(r"https?://[^\s)]+", re.IGNORECASE)
+# http(s) URL with a non-empty, whitespace-free authority; groups are (netloc, path).
+_HTTP_URL_RE = re.compile(r"^https?://([^/?#\s]+)([^?#\s]*)", re.IGNORECASE)
+
+# Request classifiers: compiled once, case-insensitive so no lowered copy is needed.
+_RAG_PATTERNS = (
+    r"\bfind\b.*\b(file|document|doc|pdf|folder)\b",
+    r"\b(search|look up|lookup)\b.*\b(my|local|computer|pc|documents|files)\b",
+    r"\bfrom\b.*\b(my|local)\b.*\b(files|documents|computer|pc)\b",
+    r"\b(use|check|scan)\b.*\b(rag|documents|files|folder)\b",
+    r"\b(open|read|summarize)\b.*\b(file|document|pdf|docx|txt)\b",
+)
+_RAG_RE = re.compile("|".join(f"(?:{p})" for p in _RAG_PATTERNS), re.IGNORECASE)
+# File-find cues, collected in one pass: a "name.ext" token (group 1 unset) or a
+# cue word. "look" only counts as part of "look up"; the lookahead leaves "up"
+# unconsumed so "look up.txt" still yields its file-name token.
+_FILE_FIND_CUES_RE = re.compile(
+    r"\b\w+\.(?:txt|md|pdf|doc|docx|ppt|pptx|xls|xlsx|csv|json|py|ts|js|cpp|c|java|go|rs)\b"
+    r"|\b(readme|find|search|locate|lookup|look(?= up\b)|where|for|about"
+    r"|file|files|folder|directory|photo|photos|picture|pictures|image|images|document|documents|pdf|docx|txt)\b",
+    re.IGNORECASE,
+)
+_CUE_VERB, _CUE_WHERE, _CUE_FOR, _CUE_NOUN = 1, 2, 4, 8
+_CUE_FLAGS = {
+    "find": _CUE_VERB | _CUE_WHERE,
+    "search": _CUE_VERB | _CUE_WHERE,
+    "locate": _CUE_VERB | _CUE_WHERE,
+    "lookup": _CUE_VERB,
+    "look": _CUE_VERB,
+    "where": _CUE_WHERE,
+    "for": _CUE_FOR,
+    "about": _CUE_FOR,
+}
+_FILE_FIND_HIT = (_CUE_VERB | _CUE_FOR, _CUE_WHERE | _CUE_NOUN)
+# Leading command words stripped from a search query (at most one, first match wins).
+# One pass over a search query: leading whitespace plus at most one command prefix
+# (case-insensitive, only when something follows it, swallowing the whitespace in
+# between), then the case-sensitive "'s linkedin" / " profile" rewrites.
+_SEARCH_QUERY_RE = re.compile(
+    r"(?P<lead>^\s*(?:(?i:please (?:open|find|search) |(?:open|find|search|look up) )\s*(?=\S))?)"
+    r"|(?P<linkedin>'s linkedin)"
+    r"| profile"
+)
+# Read once: with RAG disabled every request takes the plain LLM path.
+_RAG_ENABLED = settings.rag_enabled
+# Whitespace, wrapping brackets/quotes and trailing punctuation around a URL.
+_URL_STRIP_CHARS = " \t\n\r\x0b\x0c<>[](){}\"'.,;:!?"
+# Fallback-plan intent words, classified in one scan by group name ("open" counts for
+# both checks). Substring matches, no word boundaries: "linkedin" is a "link" intent.
+_INTENT_RE = re.compile(
+    r"(?P<both>open)|(?P<open>browser|link)|(?P<wants>find|search|profile|page)",
+    re.IGNORECASE,
+)
+# Keyword -> folder under the user's home, in priority order.
+_FOLDER_HINTS = {
+    "downloads": "Downloads",
+    "documents": "Documents",
+    "desktop": "Desktop",
+    "pictures": "Pictures",
+    "photos": "Pictures",
+    "videos": "Videos",
+    "music": "Music",
+}
+_FOLDER_KEYS_RE = re.compile("|".join(_FOLDER_HINTS), re.IGNORECASE)
+# Existing home folders per keyword; re-probed at most every _FOLDER_CACHE_TTL_S seconds.
+_FOLDER_CACHE_TTL_S = 60.0
+_folder_cache: tuple[float, dict[str, str]] = (float("-inf"), {})
 
 
 def _assistant_from_draft(title: str, content: str) -> str:
@@ -24,46 +98,35 @@ def _assistant_from_draft(title: str, content: str) -> str:
     return (title or "").strip()
 
 
+def _search_cleanup(m: re.Match) -> str:
+    if m.lastgroup == "lead":
+        return ""
+    return " linkedin" if m.lastgroup == "linkedin" else " "
+
+
+# Pure and called by both the plan normalizer and the fallback for the same message.
+@lru_cache(maxsize=1024)
 def _normalize_search_query(query: str) -> str:
-    q = (query or "").strip()
-    prefixes = [
-        "open ",
-        "find ",
-        "search ",
-        "look up ",
-        "please open ",
-        "please find ",
-        "please search ",
-    ]
-    lowered = q.lower()
-    for p in prefixes:
-        if lowered.startswith(p):
-            q = q[len(p):].strip()
-            lowered = q.lower()
-            break
-    q = q.replace("'s linkedin", " linkedin").replace(" profile", " ").strip()
-    return " ".join(q.split())
+    return " ".join(_SEARCH_QUERY_RE.sub(_search_cleanup, query or "").split())
 
 
 def _sanitize_url(raw: str) -> str | None:
     if not isinstance(raw, str):
         return None
-    s = raw.strip()
-    s = s.strip("<>[](){}\"'")
-    s = s.rstrip(".,;:!?")
-    if not s:
-        return None
-    parsed = urlparse(s)
-    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
-        return None
-    return s
+    return _sanitize_url_text(raw)
+
 
+# Assistant outputs tend to repeat the same handful of URLs.
+@lru_cache(maxsize=512)
+def _sanitize_url_text(raw: str) -> str | None:
+    s = raw.strip(_URL_STRIP_CHARS)
+    return s if _HTTP_URL_RE.match(s) else None
 
+
+@lru_cache(maxsize=512)
 def _is_linkedin_profile_url(url: str) -> bool:
-    parsed = urlparse(url)
-    host = (parsed.netloc or "").lower()
-    path = (parsed.path or "").lower()
-    return "linkedin.com" in host and path.startswith("/in/")
+    m = _HTTP_URL_RE.match(url)
+    return bool(m and "linkedin.com" in m.group(1).lower() and m.group(2).lower().startswith("/in/"))
 
 
 def _normalize_tool_plan(user_message: str, tool_plan: dict | None) -> dict | None:
@@ -73,75 +136,84 @@ def _normalize_tool_plan(user_message: str, tool_plan: dict | None) -> dict | No
     if not isinstance(actions, list):
         return None
 
+    # The LinkedIn substitution below only applies when the user gave no URL of their
+    # own; an empty query switches it off for the whole loop.
     user_has_explicit_url = bool(_URL_RE.search(user_message or ""))
-    normalized_query = _normalize_search_query(user_message or "")
-    has_browser_search = any(isinstance(a, dict) and a.get("tool") == "browser_search" for a in actions)
+    normalized_query = "" if user_has_explicit_url else _normalize_search_query(user_message or "")
+    search_url: str | None = None
 
+    # Single pass. A substituted LinkedIn link gets a browser_search in front of its
+    # open_links unless the plan already has one anywhere, so only the slot is
+    # remembered here and the action is inserted once the whole plan was seen.
     normalized_actions: list[dict] = []
+    has_browser_search = False
+    search_slot: int | None = None
     for action in actions:
         if not isinstance(action, dict):
             continue
         tool = action.get("tool")
         params = action.get("params")
-        if tool == "open_links" and isinstance(params, dict):
-            urls = params.get("urls")
-            if not isinstance(urls, list):
-                continue
-            sanitized_urls: list[str] = []
-            for u in urls:
-                su = _sanitize_url(u)
-                if su and su not in sanitized_urls:
-                    sanitized_urls.append(su)
-            if not sanitized_urls:
-                continue
-
-            # Do not trust model-guessed LinkedIn profile slugs unless user supplied a URL.
-            if (not user_has_explicit_url) and any(_is_linkedin_profile_url(u) for u in sanitized_urls):
-                if normalized_query and not has_browser_search:
-                    normalized_actions.append(
-                        {
-                            "tool": "browser_search",
-                            "params": {"query": normalized_query, "max_results": 5, "headless": True},
-                        }
-                    )
-                    has_browser_search = True
-                if normalized_query:
-                    sanitized_urls = [f"https://www.google.com/search?q={quote_plus(normalized_query)}"]
-
-            normalized_actions.append({"tool": "open_links", "params": {"urls": sanitized_urls[:10]}})
+        if tool != "open_links" or not isinstance(params, dict):
+            has_browser_search = has_browser_search or tool == "browser_search"
+            normalized_actions.append(action)
             continue
 
-        normalized_actions.append(action)
+        urls = params.get("urls")
+        if not isinstance(urls, list):
+            continue
+        sanitized_urls = list(dict.fromkeys(su for su in map(_sanitize_url, urls) if su))
+        if not sanitized_urls:
+            continue
+
+        # Do not trust model-guessed LinkedIn profile slugs unless user supplied a URL.
+        if normalized_query and any(map(_is_linkedin_profile_url, sanitized_urls)):
+            if search_slot is None:
+                search_slot = len(normalized_actions)
+            if search_url is None:
+                search_url = f"https://www.google.com/search?q={quote_plus(normalized_query)}"
+            sanitized_urls = [search_url]
 
+        normalized_actions.append({"tool": "open_links", "params": {"urls": sanitized_urls[:10]}})
+
+    if search_slot is not None and not has_browser_search:
+        normalized_actions.insert(
+            search_slot,
+            {
+                "tool": "browser_search",
+                "params": {"query": normalized_query, "max_results": 5, "headless": True},
+            },
+        )
     if not normalized_actions:
         return None
     return {"actions": normalized_actions}
 
 
 def _fallback_tool_plan(user_message: str, assistant_message: str) -> dict | None:
-    text = f"{user_message}\n{assistant_message}".lower()
+    """Plan built from the user's own message; returned already in _normalize_tool_plan form."""
+    text = f"{user_message}\n{assistant_message}"
     # Only trust URLs explicitly provided by the user, not assistant-generated text.
     urls = _URL_RE.findall(user_message or "")
-
-    if urls and ("open" in text or "browser" in text or "link" in text):
-        unique_urls: list[str] = []
-        seen: set[str] = set()
-        for u in urls:
-            if u not in seen:
-                unique_urls.append(u)
-                seen.add(u)
+    intents = {m.lastgroup for m in _INTENT_RE.finditer(text)}
+    has_open_intent = "both" in intents or "open" in intents
+
+    if urls and has_open_intent:
+        # Sanitized here so the plan comes out already normalized.
+        candidates = list(dict.fromkeys(urls))[:10]
+        sanitized_urls = list(dict.fromkeys(su for su in map(_sanitize_url, candidates) if su))
+        if not sanitized_urls:
+            return None
         return {
             "actions": [
                 {
                     "tool": "open_links",
-                    "params": {"urls": unique_urls[:10]},
+                    "params": {"urls": sanitized_urls},
                 }
             ]
         }
 
     # Generic, non-domain-specific fallback for "open/find/search profile/page" intents
     # when user provided no explicit URL.
-    wants_open = any(word in text for word in ["open", "find", "search", "profile", "page"])
+    wants_open = "both" in intents or "wants" in intents
     query = (user_message or "").strip()
     if wants_open and query:
         normalized_query = _normalize_search_query(query)
@@ -152,8 +224,10 @@ def _fallback_tool_plan(user_message: str, assistant_message: str) -> dict | Non
                 "params": {"query": normalized_query, "max_results": 5, "headless": True},
             }
         )
-        if any(word in text for word in ["open", "browser", "link"]):
-            search_url = f"https://www.google.com/search?q={quote_plus(normalized_query)}"
+        # Sanitized like the user's URLs: a query ending in "." leaves a trailing "."
+        # on the URL that _normalize_tool_plan would strip.
+        search_url = _sanitize_url_text(f"https://www.google.com/search?q={quote_plus(normalized_query)}")
+        if has_open_intent and search_url:
             actions.append(
                 {
                     "tool": "open_links",
@@ -165,36 +239,28 @@ def _fallback_tool_plan(user_message: str, assistant_message: str) -> dict | Non
 
 
 def _looks_like_rag_request(user_message: str) -> bool:
-    text = (user_message or "").strip().lower()
-    if not text:
+    if not user_message:
         return False
-    rag_patterns = [
-        r"\bfind\b.*\b(file|document|doc|pdf|folder)\b",
-        r"\b(search|look up|lookup)\b.*\b(my|local|computer|pc|documents|files)\b",
-        r"\bfrom\b.*\b(my|local)\b.*\b(files|documents|computer|pc)\b",
-        r"\b(use|check|scan)\b.*\b(rag|documents|files|folder)\b",
-        r"\b(open|read|summarize)\b.*\b(file|document|pdf|docx|txt)\b",
-    ]
-    return any(re.search(p, text) for p in rag_patterns)
+    return _RAG_RE.search(user_message) is not None
 
 
 def _looks_like_file_find_request(user_message: str) -> bool:
-    text = (user_message or "").strip().lower()
-    if not text:
+    # True on a file name or "readme", a find verb plus "for"/"about",
+    # or a find/where word plus a file noun.
+    if not user_message:
         return False
-    if re.search(r"\breadme\b", text):
-        return True
-    if re.search(r"\b\w+\.(txt|md|pdf|doc|docx|ppt|pptx|xls|xlsx|csv|json|py|ts|js|cpp|c|java|go|rs)\b", text):
-        return True
-    if re.search(r"\b(find|search|locate|lookup|look up)\b", text) and re.search(r"\b(for|about)\b", text):
-        return True
-    return bool(
-        re.search(r"\b(find|search|locate|where)\b", text)
-        and re.search(
-            r"\b(file|files|folder|directory|photo|photos|picture|pictures|image|images|document|documents|pdf|docx|txt)\b",
-            text,
-        )
-    )
+    seen = 0
+    for m in _FILE_FIND_CUES_RE.finditer(user_message):
+        word = m.group(1)
+        if word is None:
+            return True
+        word = word.lower()
+        if word == "readme":
+            return True
+        seen |= _CUE_FLAGS.get(word, _CUE_NOUN)
+        if any(seen & want == want for want in _FILE_FIND_HIT):
+            return True
+    return False
 
 
 def _extract_drive_hints(user_message: str) -> list[str]:
@@ -208,21 +274,24 @@ def _extract_drive_hints(user_message: str) -> list[str]:
     return out
 
 
+def _folder_candidates() -> dict[str, str]:
+    global _folder_cache
+    checked_at, found = _folder_cache
+    now = time.monotonic()
+    if now - checked_at >= _FOLDER_CACHE_TTL_S:
+        home = Path.home()
+        found = {key: str(home / folder) for key, folder in _FOLDER_HINTS.items() if (home / folder).exists()}
+        _folder_cache = (now, found)
+    return found
+
+
 def _extract_named_folder_hint(user_message: str) -> str | None:
-    text = (user_message or "").lower()
-    home = Path.home()
-    candidates = [
-        ("downloads", home / "Downloads"),
-        ("documents", home / "Documents"),
-        ("desktop", home / "Desktop"),
-        ("pictures", home / "Pictures"),
-        ("photos", home / "Pictures"),
-        ("videos", home / "Videos"),
-        ("music", home / "Music"),
-    ]
-    for key, path in candidates:
-        if key in text and path.exists():
-            return str(path)
+    mentioned = {m.lower() for m in _FOLDER_KEYS_RE.findall(user_message or "")}
+    if not mentioned:
+        return None
+    for key, path in _folder_candidates().items():
+        if key in mentioned:
+            return path
     return None
 
 
@@ -240,143 +309,159 @@ def _rag_context_block(hits: list[dict]) -> str:
     for i, hit in enumerate(hits, start=1):
         path = str(hit.get("path") or "")
         snippet = str(hit.get("snippet") or "").replace("\n", " ").strip()
-        lines.append(f"[RAG {i}] path={path}")
-        lines.append(f"[RAG {i}] snippet={snippet[:700]}")
+        lines.append(f"[RAG {i}] path={path}\n[RAG {i}] snippet={snippet[:700]}")
     lines.append("If context is not relevant, ignore it.")
     return "\n".join(lines)
 
 
+async def _load_conversation(db: AsyncSession, conversation_id: str | None) -> tuple[Conversation, list[dict]]:
+    if not conversation_id:
+        # Client-side id: no commit/refresh round-trip needed to learn it.
+        return Conversation(id=str(uuid.uuid4()), title="New chat"), []
+
+    # Conversation + (role, content) of its most recent turns in one round-trip;
+    # providers never look further back than _HISTORY_LIMIT messages.
+    rows = (
+        await db.execute(
+            select(Conversation, Message.role, Message.content)
+            .outerjoin(Message, Message.conversation_id == Conversation.id)
+            .where(Conversation.id == conversation_id)
+            .order_by(Message.created_at.desc())
+            .limit(_HISTORY_LIMIT)
+        )
+    ).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    history = [{"role": role, "content": content} for _, role, content in reversed(rows) if role is not None]
+    return rows[0][0], history
+
+
+def _response(
+    conv: Conversation,
+    assistant_message: str,
+    draft: Draft,
+    *,
+    tool_plan: dict | None = None,
+    rag_hits: list[dict] | None = None,
+    perm_required: bool = False,
+    perm_msg: str | None = None,
+    suggested_path: str | None = None,
+) -> ChatOut:
+    """
+    ChatOut shared by every return in chat(). All values are server-built, so the
+    model is constructed without validation; FastAPI passes an instance of the
+    response model straight to pydantic's JSON serializer.
+    """
+    return ChatOut.model_construct(
+        conversation_id=conv.id,
+        assistant_message=assistant_message,
+        draft=DraftOut.model_construct(
+            id=draft.id,
+            type=draft.type,
+            title=draft.title,
+            content=draft.content,
+            status=draft.status,
+        ),
+        tool_plan=tool_plan,
+        rag_hits=rag_hits or [],
+        rag_permission_required=perm_required,
+        rag_permission_message=perm_msg,
+        rag_suggested_path=suggested_path,
+    )
+
+
+async def _return_assistant_only(
+    db: AsyncSession,
+    conv: Conversation,
+    assistant_message: str,
+    *,
+    rag_hits: list[dict] | None = None,
+    permission_path: str | None = None,
+) -> ChatOut:
+    """
+    Response for the guard/file-search paths that answer without the LLM. The
+    conversation, both turns and the draft are committed before returning: the
+    client approves the draft and reloads history as soon as the response arrives.
+    `permission_path` marks a folder-permission prompt.
+    """
+    draft = Draft(
+        id=str(uuid.uuid4()),
+        conversation_id=conv.id,
+        type="assistant",
+        title="",
+        content=assistant_message,
+        status=DraftStatus.drafting.value,
+    )
+    conv.last_message_preview = preview(assistant_message)
+    db.add_all([draft, Message(conversation_id=conv.id, role="assistant", content=assistant_message)])
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return _response(
+        conv,
+        assistant_message,
+        draft,
+        rag_hits=rag_hits,
+        perm_required=permission_path is not None,
+        perm_msg=assistant_message if permission_path is not None else None,
+        suggested_path=permission_path,
+    )
+
+
 @router.post("/chat", response_model=ChatOut, responses={404: {"model": ErrorOut}, 502: {"model": ErrorOut}})
 async def chat(
     inp: ChatIn,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     llm=Depends(get_llm),
     rag: RagService = Depends(get_rag),
 ):
-    if inp.conversation_id:
-        conv = db.get(Conversation, inp.conversation_id)
-        if not conv:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-    else:
-        conv = Conversation(title="New chat")
-        db.add(conv)
-        db.commit()
-        db.refresh(conv)
-
-    history_rows = (
-        db.query(Message)
-        .filter(Message.conversation_id == conv.id)
-        .order_by(Message.created_at.asc())
-        .all()
-    )
-    history = [{"role": m.role, "content": m.content} for m in history_rows]
-
-    db.add(Message(conversation_id=conv.id, role="user", content=inp.message))
-    db.commit()
-
-    permissions = rag.list_permissions()
-    force_file_search = bool(getattr(inp, "force_file_search", False))
-
-    if (force_file_search or _looks_like_rag_request(inp.message)) and not permissions:
+    # Everything below is staged on the session and written in a single commit
+    # per request (one fsync instead of one per row).
+    force_file_search = _RAG_ENABLED and bool(getattr(inp, "force_file_search", False))
+    # The plain chat path always consults the RAG index; start that search together
+    # with the DB read and the permission lookup instead of after them.
+    file_find = _RAG_ENABLED and _looks_like_file_find_request(inp.message)
+    plain_chat = not (force_file_search or file_find)
+    pending = [
+        _load_conversation(db, inp.conversation_id),
+        asyncio.to_thread(rag.list_permissions),
+    ]
+    if plain_chat:
+        pending.append(asyncio.to_thread(rag.search, inp.message, top_k=4, mode="semantic"))
+    (conv, history), permissions, *searched = await asyncio.gather(*pending)
+
+    # Return the connection to the pool before the slow part (file search / LLM);
+    # rows are only staged from here on and the connection is taken back at flush.
+    await db.close()
+    db.add_all([conv, Message(conversation_id=conv.id, role="user", content=inp.message)])
+    if conv.derived_title is None:
+        conv.derived_title = derive_title(inp.message)
+
+    rag_request = force_file_search or (_RAG_ENABLED and _looks_like_rag_request(inp.message))
+    if rag_request and not permissions:
         assistant_message = (
             "Sure, but I need your permission to access local files first. "
             "Please approve folder access in the permission popup."
         )
-        draft = Draft(
-            conversation_id=conv.id,
-            type="assistant",
-            title="",
-            content=assistant_message,
-            status=DraftStatus.drafting.value,
-        )
-        db.add(draft)
-        db.add(Message(conversation_id=conv.id, role="assistant", content=assistant_message))
-        db.commit()
-        db.refresh(draft)
-        return {
-            "conversation_id": conv.id,
-            "assistant_message": assistant_message,
-            "draft": {
-                "id": draft.id,
-                "type": draft.type,
-                "title": draft.title,
-                "content": draft.content,
-                "status": draft.status,
-            },
-            "tool_plan": None,
-            "rag_hits": [],
-            "rag_permission_required": True,
-            "rag_permission_message": assistant_message,
-            "rag_suggested_path": _default_docs_path(),
-        }
+        return await _return_assistant_only(db, conv, assistant_message, permission_path=_default_docs_path())
 
-    if _looks_like_file_find_request(inp.message) and not force_file_search:
+    if file_find and not force_file_search:
         assistant_message = (
             "Please turn on File Search mode and select allowed folders/disks to search. "
             "Then ask your file query again."
         )
-        draft = Draft(
-            conversation_id=conv.id,
-            type="assistant",
-            title="",
-            content=assistant_message,
-            status=DraftStatus.drafting.value,
-        )
-        db.add(draft)
-        db.add(Message(conversation_id=conv.id, role="assistant", content=assistant_message))
-        db.commit()
-        db.refresh(draft)
-        return {
-            "conversation_id": conv.id,
-            "assistant_message": assistant_message,
-            "draft": {
-                "id": draft.id,
-                "type": draft.type,
-                "title": draft.title,
-                "content": draft.content,
-                "status": draft.status,
-            },
-            "tool_plan": None,
-            "rag_hits": [],
-            "rag_permission_required": False,
-            "rag_permission_message": None,
-            "rag_suggested_path": None,
-        }
+        return await _return_assistant_only(db, conv, assistant_message)
 
-    if force_file_search or _looks_like_file_find_request(inp.message):
+    if not plain_chat:
         folder_hint = _extract_named_folder_hint(inp.message)
         if folder_hint and not rag.is_path_allowed(folder_hint):
             assistant_message = (
                 f"Sure, but I need your permission to access {folder_hint} first. "
                 "Please approve folder access in the permission popup."
             )
-            draft = Draft(
-                conversation_id=conv.id,
-                type="assistant",
-                title="",
-                content=assistant_message,
-                status=DraftStatus.drafting.value,
-            )
-            db.add(draft)
-            db.add(Message(conversation_id=conv.id, role="assistant", content=assistant_message))
-            db.commit()
-            db.refresh(draft)
-            return {
-                "conversation_id": conv.id,
-                "assistant_message": assistant_message,
-                "draft": {
-                    "id": draft.id,
-                    "type": draft.type,
-                    "title": draft.title,
-                    "content": draft.content,
-                    "status": draft.status,
-                },
-                "tool_plan": None,
-                "rag_hits": [],
-                "rag_permission_required": True,
-                "rag_permission_message": assistant_message,
-                "rag_suggested_path": folder_hint,
-            }
+            return await _return_assistant_only(db, conv, assistant_message, permission_path=folder_hint)
 
         drive_hints = _extract_drive_hints(inp.message)
         if drive_hints:
@@ -387,36 +472,10 @@ async def chat(
                     f"Sure, but I need your permission to access {needed[0]} first. "
                     "Please approve folder access in the permission popup."
                 )
-                draft = Draft(
-                    conversation_id=conv.id,
-                    type="assistant",
-                    title="",
-                    content=assistant_message,
-                    status=DraftStatus.drafting.value,
-                )
-                db.add(draft)
-                db.add(Message(conversation_id=conv.id, role="assistant", content=assistant_message))
-                db.commit()
-                db.refresh(draft)
-                return {
-                    "conversation_id": conv.id,
-                    "assistant_message": assistant_message,
-                    "draft": {
-                        "id": draft.id,
-                        "type": draft.type,
-                        "title": draft.title,
-                        "content": draft.content,
-                        "status": draft.status,
-                    },
-                    "tool_plan": None,
-                    "rag_hits": [],
-                    "rag_permission_required": True,
-                    "rag_permission_message": assistant_message,
-                    "rag_suggested_path": needed[0],
-                }
+                return await _return_assistant_only(db, conv, assistant_message, permission_path=needed[0])
 
         file_roots = [folder_hint] if folder_hint and rag.is_path_allowed(folder_hint) else None
-        file_hits = rag.find_files(inp.message, top_k=8, roots=file_roots)
+        file_hits = await asyncio.to_thread(rag.find_files, inp.message, top_k=8, roots=file_roots)
         rag_payload = [{"path": h.path, "score": round(h.score, 4), "snippet": h.snippet} for h in file_hits]
         if file_hits:
             assistant_message = "I found these matching local paths:\n" + "\n".join(
@@ -428,35 +487,9 @@ async def chat(
                 "Try adding more details like filename, extension, or parent folder."
             )
 
-        draft = Draft(
-            conversation_id=conv.id,
-            type="assistant",
-            title="",
-            content=assistant_message,
-            status=DraftStatus.drafting.value,
-        )
-        db.add(draft)
-        db.add(Message(conversation_id=conv.id, role="assistant", content=assistant_message))
-        db.commit()
-        db.refresh(draft)
-        return {
-            "conversation_id": conv.id,
-            "assistant_message": assistant_message,
-            "draft": {
-                "id": draft.id,
-                "type": draft.type,
-                "title": draft.title,
-                "content": draft.content,
-                "status": draft.status,
-            },
-            "tool_plan": None,
-            "rag_hits": rag_payload,
-            "rag_permission_required": False,
-            "rag_permission_message": None,
-            "rag_suggested_path": None,
-        }
+        return await _return_assistant_only(db, conv, assistant_message, rag_hits=rag_payload)
 
-    rag_hits = rag.search(inp.message, top_k=4)
+    rag_hits = searched[0]
     llm_message = inp.message
     if rag_hits:
         rag_payload = [{"path": h.path, "score": round(h.score, 4), "snippet": h.snippet} for h in rag_hits]
@@ -484,10 +517,9 @@ async def chat(
             if len(source_paths) >= 4:
                 break
         if source_paths:
-            assistant_message = (
-                f"{assistant_message}\n\nSources:\n"
-                + "\n".join(f"- {p}" for p in source_paths)
-            )
+            parts = [assistant_message, "", "Sources:"]
+            parts.extend(f"- {p}" for p in source_paths)
+            assistant_message = "\n".join(parts)
 
     draft = Draft(
         conversation_id=conv.id,
@@ -497,35 +529,25 @@ async def chat(
         status=DraftStatus.drafting.value,
     )
     db.add(draft)
-    db.commit()
-    db.refresh(draft)
 
-    tool_plan = out.tool_plan.model_dump() if out.tool_plan else None
-    tool_plan = _normalize_tool_plan(inp.message, tool_plan)
-    has_actions = isinstance((tool_plan or {}).get("actions"), list) and bool(tool_plan.get("actions"))
-    if not has_actions:
+    # The plan is dumped once; _normalize_tool_plan returns either None or a plan
+    # with a non-empty "actions" list, and that dict is what gets stored and returned.
+    tool_plan_raw = out.tool_plan.model_dump() if out.tool_plan else None
+    tool_plan = _normalize_tool_plan(inp.message, tool_plan_raw)
+    if tool_plan is None:
         tool_plan = _fallback_tool_plan(inp.message, assistant_message)
-        tool_plan = _normalize_tool_plan(inp.message, tool_plan)
-
-    if isinstance((tool_plan or {}).get("actions"), list):
-        ApprovalService(db).upsert_tool_plan(draft, tool_plan)
 
+    conv.last_message_preview = preview(assistant_message)
+    # Written with everything else: the client reloads history right after this returns.
     db.add(Message(conversation_id=conv.id, role="assistant", content=assistant_message))
-    db.commit()
-
-    return {
-        "conversation_id": conv.id,
-        "assistant_message": assistant_message,
-        "draft": {
-            "id": draft.id,
-            "type": draft.type,
-            "title": draft.title,
-            "content": draft.content,
-            "status": draft.status,
-        },
-        "tool_plan": tool_plan,
-        "rag_hits": rag_payload,
-        "rag_permission_required": False,
-        "rag_permission_message": None,
-        "rag_suggested_path": None,
-    }
+
+    # upsert_tool_plan flushes, which takes the write lock; roll back right away on
+    # failure instead of holding it until the session is torn down.
+    try:
+        if tool_plan is not None:
+            await db.run_sync(lambda session: ApprovalService(session).upsert_tool_plan(draft, tool_plan))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return _response(conv, assistant_message, draft, tool_plan=tool_plan, rag_hits=rag_payload)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 from localflow.api.deps import get_db
 from localflow.storage.models import Approval, Conversation, Draft, Execution, Message
@@ -79,24 +80,18 @@ class ConversationAuditOut(BaseModel):
     approvals: List[ApprovalAuditOut]
 
 
-def _preview(text: str, n: int = 90) -> str:
-    s = (text or "").strip().replace("\n", " ")
-    return s if len(s) <= n else s[:n] + "..."
-
-
-def _derive_title(messages: List[Message]) -> str:
-    for m in messages:
-        if (m.role or "").lower() == "user" and (m.content or "").strip():
-            s = m.content.strip().replace("\n", " ")
-            return s if len(s) <= 60 else s[:60] + "..."
-    return "Conversation"
+def _json_response(payload: Any) -> Response:
+    # The read endpoints below build their payloads from trusted rows, so they hand
+    # orjson plain dicts and return the bytes directly. FastAPI passes a Response
+    # through untouched; response_model stays on the routes for the OpenAPI schema.
+    return Response(content=orjson.dumps(payload, option=orjson.OPT_UTC_Z), media_type="application/json")
 
 
 def _json_or_raw(value: str) -> Any:
     if not value:
         return {}
     try:
-        return json.loads(value)
+        return orjson.loads(value)
     except Exception:
         return {"raw": value}
 
@@ -106,23 +101,43 @@ def list_conversations(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     db=Depends(get_db),
-) -> ConversationListOut:
-    total = db.query(Conversation).count()
-
-    last_activity_subq = (
+) -> Response:
+    # Title and preview are stored on the conversation row (see chat()); only the
+    # counts and the latest draft are computed here, in the same statement.
+    msg_stats = (
         db.query(
             Message.conversation_id.label("cid"),
+            func.count().label("message_count"),
             func.max(Message.created_at).label("last_activity_at"),
         )
         .group_by(Message.conversation_id)
         .subquery()
     )
 
+    draft_ranked = db.query(
+        Draft.conversation_id.label("cid"),
+        Draft.id.label("draft_id"),
+        func.row_number()
+        .over(partition_by=Draft.conversation_id, order_by=Draft.created_at.desc())
+        .label("rn"),
+    ).subquery()
+    latest_draft = db.query(draft_ranked.c.cid, draft_ranked.c.draft_id).filter(draft_ranked.c.rn == 1).subquery()
+
     rows = (
-        db.query(Conversation, last_activity_subq.c.last_activity_at)
-        .outerjoin(last_activity_subq, last_activity_subq.c.cid == Conversation.id)
+        db.query(
+            Conversation.id,
+            Conversation.created_at,
+            Conversation.derived_title,
+            Conversation.last_message_preview,
+            msg_stats.c.last_activity_at,
+            msg_stats.c.message_count,
+            latest_draft.c.draft_id,
+            func.count().over().label("total"),
+        )
+        .outerjoin(msg_stats, msg_stats.c.cid == Conversation.id)
+        .outerjoin(latest_draft, latest_draft.c.cid == Conversation.id)
         .order_by(
-            last_activity_subq.c.last_activity_at.desc().nullslast(),
+            msg_stats.c.last_activity_at.desc().nullslast(),
             Conversation.created_at.desc(),
         )
         .offset(offset)
@@ -130,45 +145,26 @@ def list_conversations(
         .all()
     )
 
-    items: List[ConversationListItem] = []
-    for c, last_activity_at in rows:
-        msgs: List[Message] = (
-            db.query(Message)
-            .filter(Message.conversation_id == c.id)
-            .order_by(Message.created_at.asc())
-            .limit(200)
-            .all()
-        )
+    if rows:
+        total = rows[0].total
+    else:
+        # Empty page: an offset past the end still reports the real total.
+        total = db.query(Conversation).count() if offset else 0
 
-        last_msg: Optional[Message] = (
-            db.query(Message)
-            .filter(Message.conversation_id == c.id)
-            .order_by(Message.created_at.desc())
-            .first()
-        )
+    items = [
+        {
+            "id": r.id,
+            "created_at": r.created_at,
+            "last_activity_at": r.last_activity_at or r.created_at,
+            "title": r.derived_title or "Conversation",
+            "last_message_preview": r.last_message_preview or "",
+            "message_count": r.message_count or 0,
+            "latest_draft_id": r.draft_id,
+        }
+        for r in rows
+    ]
 
-        message_count = db.query(Message).filter(Message.conversation_id == c.id).count()
-
-        latest_draft: Optional[Draft] = (
-            db.query(Draft)
-            .filter(Draft.conversation_id == c.id)
-            .order_by(Draft.created_at.desc())
-            .first()
-        )
-
-        items.append(
-            ConversationListItem(
-                id=c.id,
-                created_at=c.created_at,
-                last_activity_at=last_activity_at or c.created_at,
-                title=_derive_title(msgs),
-                last_message_preview=_preview(last_msg.content if last_msg else ""),
-                message_count=message_count,
-                latest_draft_id=(latest_draft.id if latest_draft else None),
-            )
-        )
-
-    return ConversationListOut(items=items, total=total, limit=limit, offset=offset)
+    return _json_response({"items": items, "total": total, "limit": limit, "offset": offset})
 
 
 @router.get("/conversations/{conversation_id}", response_model=ConversationDetailOut)
@@ -176,13 +172,14 @@ def get_conversation(
     conversation_id: str,
     message_limit: int = Query(500, ge=1, le=2000),
     db=Depends(get_db),
-) -> ConversationDetailOut:
-    c: Optional[Conversation] = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+) -> Response:
+    # Plain column rows: no ORM objects/identity map for data that is only copied out.
+    c = db.query(Conversation.id, Conversation.created_at).filter(Conversation.id == conversation_id).first()
     if not c:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    messages: List[Message] = (
-        db.query(Message)
+    messages = (
+        db.query(Message.id, Message.role, Message.content, Message.created_at)
         .filter(Message.conversation_id == conversation_id)
         .order_by(Message.created_at.asc())
         .limit(message_limit)
@@ -196,71 +193,72 @@ def get_conversation(
         .first()
     )
 
-    latest_draft_out: Optional[DraftOut] = None
+    latest_draft_out: Optional[dict] = None
     latest_tool_plan: Any | None = None
     if latest_draft:
-        latest_draft_out = DraftOut(
-            id=latest_draft.id,
-            type=getattr(latest_draft, "type", "assistant"),
-            title=getattr(latest_draft, "title", "") or "",
-            content=getattr(latest_draft, "content", "") or "",
-            status=str(getattr(latest_draft, "status", "")),
-            created_at=latest_draft.created_at,
-            updated_at=getattr(latest_draft, "updated_at", None),
-        )
+        latest_draft_out = {
+            "id": latest_draft.id,
+            "type": getattr(latest_draft, "type", "assistant"),
+            "title": getattr(latest_draft, "title", "") or "",
+            "content": getattr(latest_draft, "content", "") or "",
+            "status": str(getattr(latest_draft, "status", "")),
+            "created_at": latest_draft.created_at,
+            "updated_at": getattr(latest_draft, "updated_at", None),
+        }
         latest_tool_plan = _json_or_raw(latest_draft.tool_plan.json_canonical) if latest_draft.tool_plan else None
 
-    return ConversationDetailOut(
-        id=c.id,
-        created_at=c.created_at,
-        messages=[MessageOut(id=m.id, role=m.role, content=m.content, created_at=m.created_at) for m in messages],
-        latest_draft=latest_draft_out,
-        latest_tool_plan=latest_tool_plan,
+    return _json_response(
+        {
+            "id": c.id,
+            "created_at": c.created_at,
+            "messages": [
+                {"id": m.id, "role": m.role, "content": m.content, "created_at": m.created_at} for m in messages
+            ],
+            "latest_draft": latest_draft_out,
+            "latest_tool_plan": latest_tool_plan,
+        }
     )
 
 
 @router.get("/conversations/{conversation_id}/audit", response_model=ConversationAuditOut)
-def get_conversation_audit(conversation_id: str, db=Depends(get_db)) -> ConversationAuditOut:
-    c: Optional[Conversation] = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+def get_conversation_audit(conversation_id: str, db=Depends(get_db)) -> Response:
+    c = db.query(Conversation.id).filter(Conversation.id == conversation_id).first()
     if not c:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
+    # Executions for every approval come in one extra SELECT ... IN, not one per approval.
     approvals = (
         db.query(Approval)
+        .options(selectinload(Approval.executions))
         .join(Draft, Draft.id == Approval.draft_id)
         .filter(Draft.conversation_id == conversation_id)
         .order_by(Approval.created_at.asc())
         .all()
     )
 
-    out: List[ApprovalAuditOut] = []
+    out: List[dict] = []
     for approval in approvals:
-        executions: List[Execution] = (
-            db.query(Execution)
-            .filter(Execution.approval_id == approval.id)
-            .order_by(Execution.created_at.asc())
-            .all()
-        )
+        executions: List[Execution] = sorted(approval.executions, key=lambda e: e.created_at)
 
         out.append(
-            ApprovalAuditOut(
-                id=approval.id,
-                draft_id=approval.draft_id,
-                created_at=approval.created_at,
-                draft_hash=approval.draft_hash,
-                toolplan_hash=approval.toolplan_hash,
-                executions=[
-                    ExecutionAuditOut(
-                        id=e.id,
-                        tool_name=e.tool_name,
-                        status=e.status,
-                        created_at=e.created_at,
-                        request=_json_or_raw(e.request_json),
-                        result=_json_or_raw(e.result_json),
-                    )
+            {
+                "id": approval.id,
+                "draft_id": approval.draft_id,
+                "created_at": approval.created_at,
+                "draft_hash": approval.draft_hash,
+                "toolplan_hash": approval.toolplan_hash,
+                "executions": [
+                    {
+                        "id": e.id,
+                        "tool_name": e.tool_name,
+                        "status": e.status,
+                        "created_at": e.created_at,
+                        "request": _json_or_raw(e.request_json),
+                        "result": _json_or_raw(e.result_json),
+                    }
                     for e in executions
                 ],
-            )
+            }
         )
 
-    return ConversationAuditOut(conversation_id=conversation_id, approvals=out)
+    return _json_response({"conversation_id": conversation_id, "approvals": out})
@@ -1,5 +1,4 @@
-import json
-
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
@@ -41,7 +40,7 @@ async def execute(inp: ExecuteIn, db: Session = Depends(get_db), tools=Depends(g
         raise HTTPException(status_code=status_code, detail=message)
 
     try:
-        result_obj = json.loads(exe.result_json)
+        result_obj = orjson.loads(exe.result_json)
     except Exception:
         result_obj = {"raw": exe.result_json}
     return {"execution_id": exe.id, "status": exe.status, "result": result_obj}
@@ -1,18 +1,28 @@
-from fastapi import APIRouter, Request
+import orjson
+from fastapi import APIRouter, Request, Response
 
 from ...core.config import settings
 from .schemas import HealthOut
 
 router = APIRouter()
 
+# Settings don't change while the process runs; only provider presence is per-app state.
+_STATIC_HEALTH = {
+    "app": settings.app_name,
+    "env": settings.env,
+    "llm_provider": settings.llm_provider,
+    "ollama_base_url": settings.ollama_base_url,
+    "ollama_model": settings.ollama_model,
+}
+
+
+# Health checks poll this; both possible bodies are serialized once up front.
+_HEALTH_BODIES = {
+    flag: orjson.dumps({**_STATIC_HEALTH, "has_llm_provider": flag}) for flag in (False, True)
+}
+
 
 @router.get("/health", response_model=HealthOut)
-def health(request: Request):
-    return {
-        "app": settings.app_name,
-        "env": settings.env,
-        "llm_provider": settings.llm_provider,
-        "ollama_base_url": settings.ollama_base_url,
-        "ollama_model": settings.ollama_model,
-        "has_llm_provider": request.app.state.llm_provider is not None,
-    }
+async def health(request: Request):
+    body = _HEALTH_BODIES[request.app.state.llm_provider is not None]
+    return Response(content=body, media_type="application/json")
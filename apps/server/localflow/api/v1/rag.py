@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from typing import Any
+
+import orjson
 from pydantic import BaseModel, Field
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from localflow.api.deps import get_rag
-from localflow.rag.service import RagService
+from localflow.domain.hashing import sha256_bytes
+from localflow.rag.service import RagService, RetrievalMode
 
 router = APIRouter(tags=["rag"])
 
@@ -30,6 +34,9 @@ class RagSearchIn(BaseModel):
     query: str
     top_k: int = Field(default=5, ge=1, le=12)
     roots: list[str] | None = None
+    retrieval_mode: RetrievalMode = "hybrid"
+    rerank: bool = True
+    rerank_pool: int = Field(default=25, ge=5, le=100)
 
 
 class RagHitOut(BaseModel):
@@ -46,14 +53,36 @@ class RagListDirsIn(BaseModel):
     path: str | None = None
 
 
+# The GET endpoints below are polled by the UI; the service memoizes them for a few
+# seconds and clients may reuse a response for as long.
+_POLL_CACHE_CONTROL = "private, max-age=5"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, so W/"x" and "x" are the same tag.
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _polled_json_response(request: Request, payload: Any) -> Response:
+    body = orjson.dumps(payload)
+    etag = f'W/"{sha256_bytes(body)[:16]}"'
+    headers = {"ETag": etag, "Cache-Control": _POLL_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/rag/permissions", response_model=RagPermissionsOut)
-def list_permissions(rag: RagService = Depends(get_rag)):
-    return {"roots": rag.list_permissions()}
+def list_permissions(request: Request, rag: RagService = Depends(get_rag)):
+    return _polled_json_response(request, {"roots": rag.list_permissions()})
 
 
 @router.get("/rag/drives")
-def list_drives(rag: RagService = Depends(get_rag)):
-    return {"drives": rag.list_available_drives()}
+def list_drives(request: Request, rag: RagService = Depends(get_rag)):
+    return _polled_json_response(request, {"drives": rag.list_available_drives()})
 
 
 @router.post("/rag/list_dirs")
@@ -90,8 +119,8 @@ def set_permissions(inp: RagSetPermissionsIn, rag: RagService = Depends(get_rag)
 
 
 @router.get("/rag/status")
-def rag_status(rag: RagService = Depends(get_rag)):
-    return rag.status()
+def rag_status(request: Request, rag: RagService = Depends(get_rag)):
+    return _polled_json_response(request, rag.status())
 
 
 @router.post("/rag/index")
@@ -105,12 +134,18 @@ def rag_index(inp: RagIndexIn, rag: RagService = Depends(get_rag)):
 @router.post("/rag/search", response_model=RagSearchOut)
 def rag_search(inp: RagSearchIn, rag: RagService = Depends(get_rag)):
     try:
-        hits = rag.search(inp.query, top_k=inp.top_k, roots=inp.roots)
+        hits = rag.search(
+            inp.query,
+            top_k=inp.top_k,
+            roots=inp.roots,
+            mode=inp.retrieval_mode,
+            rerank=inp.rerank,
+            rerank_pool=inp.rerank_pool,
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return {
-        "hits": [
-            {"path": h.path, "score": round(h.score, 4), "snippet": h.snippet}
-            for h in hits
-        ]
-    }
+    # Hits come from the service already typed; build the response models directly
+    # instead of having FastAPI re-validate a list of dicts against RagSearchOut.
+    return RagSearchOut.model_construct(
+        hits=[RagHitOut.model_construct(path=h.path, score=round(h.score, 4), snippet=h.snippet) for h in hits]
+    )
@@ -1,3 +1,4 @@
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -15,15 +16,32 @@ class Settings(BaseSettings):
     gemini_api_key: str | None = None
     gemini_model: str = "gemini-2.0-flash"
     llm_timeout_s: int = 120
+    llm_cache_enabled: bool = True
+    llm_cache_maxsize: int = 1000
+    llm_cache_ttl_s: int = 3600
 
-    # Prompt packs (directory-based, editable without code changes)
-    prompt_pack_dir: str = "localflow/llm/prompt_packs/default"
+    # Prompt packs (directory-based, editable without code changes);
+    # PROMPT_PACK_PATH / PROMPT_PACK are accepted as older names
+    prompt_pack_dir: str = Field(
+        default="localflow/llm/prompt_packs/default",
+        validation_alias=AliasChoices("prompt_pack_dir", "prompt_pack_path", "prompt_pack"),
+    )
 
     # Local RAG storage/index settings
+    rag_enabled: bool = True
     rag_store_dir: str = ".localflow_rag"
     rag_chunk_size: int = 1200
     rag_chunk_overlap: int = 200
     rag_embedding_dim: int = 384
+    rag_search_cache_maxsize: int = 512
+    rag_search_cache_ttl_s: int = 120
+
+    # Content hashes for approvals/tool plans: "sha256" or "blake3" (needs the blake3 package)
+    hash_algo: str = "sha256"
+
+    # Browser origins allowed by CORS (the Vite dev server by default); any
+    # localhost/127.0.0.1 port is also accepted
+    cors_origins: list[str] = ["http://localhost:5173", "http://127.0.0.1:5173"]
 
     # Security for future remote access
     api_key: str | None = None
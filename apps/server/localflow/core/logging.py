@@ -1,8 +1,24 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 
+_listener: logging.handlers.QueueListener | None = None
+
+def stop_logging() -> None:
+    """Flush the queue and stop the listener; the root logger writes directly again."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger().handlers = list(_listener.handlers)
+        _listener = None
+
 def configure_logging() -> None:
     # Minimal structured-ish logging (JSON can be added later).
+    # Loggers only enqueue records; a listener thread formats them and writes to
+    # stdout, so a slow consumer on the other end never blocks request handling.
+    global _listener
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
@@ -12,4 +28,12 @@ def configure_logging() -> None:
     )
     handler.setFormatter(formatter)
 
-    logger.handlers = [handler]
\ No newline at end of file
+    stop_logging()
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+
+    logger.handlers = [logging.handlers.QueueHandler(records)]
+
+# Flush whatever is still queued at interpreter exit.
+atexit.register(stop_logging)
@@ -1,13 +1,54 @@
-import uuid
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import secrets
+
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 CORRELATION_HEADER = "x-correlation-id"
+_CORRELATION_HEADER_RAW = CORRELATION_HEADER.encode("latin-1")
+
+class CorrelationIdMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task group or body stream): takes the
+    correlation id from the request header or generates one, exposes it as
+    request.state.correlation_id and echoes it on the response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cid = ""
+        for name, value in scope["headers"]:
+            if name == _CORRELATION_HEADER_RAW:
+                cid = value.decode("latin-1")
+                break
+        if not cid:
+            cid = secrets.token_hex(16)
+        scope.setdefault("state", {})["correlation_id"] = cid
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[CORRELATION_HEADER] = cid
+            await send(message)
+
+        await self.app(scope, receive, send_with_id)
+
+
+class LocalCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware that checks the configured origins with one set lookup before
+    trying allow_origin_regex; the stock class runs the regex first on every
+    request and preflight carrying an Origin header, even for the usual dev origins.
+    """
+
+    def __init__(self, app: ASGIApp, **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self._origin_set = frozenset(self.allow_origins)
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        cid = request.headers.get(CORRELATION_HEADER) or str(uuid.uuid4())
-        request.state.correlation_id = cid
-        response = await call_next(request)
-        response.headers[CORRELATION_HEADER] = cid
-        return response
\ No newline at end of file
+    def is_allowed_origin(self, origin: str) -> bool:
+        return origin in self._origin_set or super().is_allowed_origin(origin)
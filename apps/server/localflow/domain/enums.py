@@ -1,18 +1,18 @@
-from enum import Enum
+from enum import StrEnum
 
-class DraftStatus(str, Enum):
+class DraftStatus(StrEnum):
     drafting = "DRAFTING"
     approved_locked = "APPROVED_LOCKED"
     archived = "ARCHIVED"
 
-class ExecutionStatus(str, Enum):
+class ExecutionStatus(StrEnum):
     pending = "PENDING"
     running = "RUNNING"
     succeeded = "SUCCEEDED"
     failed = "FAILED"
     canceled = "CANCELED"
 
-class RiskLevel(str, Enum):
+class RiskLevel(StrEnum):
     low = "LOW"
     medium = "MEDIUM"
     high = "HIGH"
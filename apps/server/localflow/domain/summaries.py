@@ -0,0 +1,11 @@
+def preview(text: str, n: int = 90) -> str:
+    s = (text or "").strip().replace("\n", " ")
+    return s if len(s) <= n else s[:n] + "..."
+
+
+def derive_title(user_message: str) -> str | None:
+    """Conversation title from a user message; None if the message is blank."""
+    s = (user_message or "").strip().replace("\n", " ")
+    if not s:
+        return None
+    return s if len(s) <= 60 else s[:60] + "..."
@@ -0,0 +1,189 @@
+"""Shared draft-generation loop for providers that answer with a JSON object."""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import httpx
+import orjson
+from pydantic import ValidationError
+
+from localflow.llm._common import (
+    _PROMPT_TAIL,
+    _REPAIR_INSTRUCTIONS,
+    _extract_first_json_object,
+    _format_history,
+    _normalize_title_content,
+    _prompt_head,
+    _recover_content_from_assistant_message,
+    _repair_head,
+    _safe_truncate,
+    _synthesize_fallback_draft,
+)
+from localflow.llm.prompt_manager import PromptManager
+from localflow.llm.schemas import DRAFT_ADAPTER, DraftOut, DraftResponse, ToolPlanOut
+
+log = logging.getLogger("localflow.llm")
+
+
+class BaseJSONProvider(ABC):
+    """
+    Prompt building, the repair loop and output parsing; subclasses only implement
+    _raw_generate (one prompt in, the model's raw text out).
+    """
+
+    # Prefix for the "output invalid" warnings.
+    _log_label = "LLM"
+    # Origin that warm_up() connects to; None skips the warm-up.
+    _warmup_url: Optional[str] = None
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        prompt_manager: PromptManager,
+        model: str,
+        timeout_s: float = 120.0,
+        max_repair_attempts: int = 2,
+    ) -> None:
+        self._client = client
+        self._pm = prompt_manager
+        self._model = model
+        self._timeout_s = timeout_s
+        # The LLM may take timeout_s to answer; an unreachable host should fail fast.
+        self._timeout = httpx.Timeout(timeout_s, connect=5.0)
+        self._max_repairs = max_repair_attempts
+
+    @abstractmethod
+    async def _raw_generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    async def warm_up(self) -> None:
+        """
+        Best effort: open a pooled keep-alive connection (DNS, TCP, TLS) to the
+        provider so the first draft doesn't pay for it. Any status is fine.
+        """
+        if not self._warmup_url:
+            return
+        try:
+            await self._client.head(self._warmup_url, timeout=2.0)
+        except Exception as e:
+            log.debug("%s warm-up failed: %s", self._log_label, e)
+
+    def _build_initial_prompt(self, system: str, history_block: str, user_message: str) -> str:
+        return f"{_prompt_head(system)}{history_block}\n\nUser message:\n\n{user_message}{_PROMPT_TAIL}"
+
+    def _build_repair_prompt(
+        self,
+        system: str,
+        repair_prompt: str,
+        history_block: str,
+        raw: str,
+        user_message: str,
+    ) -> str:
+        return (
+            f"{_repair_head(system, repair_prompt)}{history_block}\n\n{_REPAIR_INSTRUCTIONS}"
+            f"\n\nPrevious output:\n\n{raw}\n\nOriginal user message:\n\n{user_message}"
+        )
+
+    async def generate_draft(
+        self,
+        user_message: str,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> DraftResponse:
+        system = self._pm.get_system()
+        repair_prompt = self._pm.get_repair()
+        history_block = _format_history(history)
+
+        prompt = self._build_initial_prompt(system, history_block, user_message)
+
+        parsed: Optional[DraftResponse] = None
+
+        for attempt in range(1, self._max_repairs + 2):
+            raw = await self._raw_generate(prompt)
+
+            parsed = self._parse_draft_response(raw)
+            if parsed and parsed.draft and not (parsed.draft.content or "").strip():
+                parsed.draft.content = _recover_content_from_assistant_message(parsed.assistant_message)
+            if parsed and parsed.draft and parsed.draft.content.strip():
+                parsed.draft = _normalize_title_content(parsed.draft)
+                if not (parsed.assistant_message or "").strip():
+                    parsed.assistant_message = parsed.draft.content[:300].strip()
+                return parsed
+
+            log.warning("%s output invalid (attempt %s): draft missing/empty", self._log_label, attempt)
+            log.warning("RAW OUTPUT (attempt %s): %r", attempt, _safe_truncate(raw))
+
+            prompt = self._build_repair_prompt(system, repair_prompt, history_block, raw, user_message)
+
+        assistant_msg = ""
+        if parsed:
+            assistant_msg = parsed.assistant_message or ""
+
+        return DraftResponse(
+            assistant_message=(assistant_msg or "").strip() or "I can help with that.",
+            draft=_synthesize_fallback_draft(assistant_msg),
+            tool_plan=None,
+        )
+
+    async def generate(
+        self,
+        user_message: str,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> DraftResponse:
+        return await self.generate_draft(user_message=user_message, history=history)
+
+    def _parse_draft_response(self, raw: str) -> Optional[DraftResponse]:
+        if not raw or not raw.strip():
+            return None
+
+        text = raw.strip()
+
+        # Usually the whole output is the object; only scan for one when it is not.
+        obj: Any = None
+        if text.startswith("{"):
+            try:
+                obj = orjson.loads(text)
+            except Exception:
+                obj = None
+        if obj is None:
+            extracted = _extract_first_json_object(text)
+            if not extracted:
+                return None
+            try:
+                obj = orjson.loads(extracted)
+            except Exception:
+                return None
+
+        if not isinstance(obj, dict):
+            return None
+
+        # Well-formed output validates in one pass. Otherwise salvage field by field:
+        # a bad tool_plan must not cost the draft (and with it another LLM round-trip).
+        try:
+            return DRAFT_ADAPTER.validate_python(obj)
+        except ValidationError as e:
+            log.debug("%s output failed validation, salvaging fields: %s", self._log_label, e)
+
+        assistant_message = str(obj.get("assistant_message") or "")
+
+        draft = None
+        if isinstance(obj.get("draft"), dict):
+            try:
+                draft = DraftOut.model_validate(obj["draft"])
+            except Exception:
+                draft = None
+
+        tool_plan = None
+        if isinstance(obj.get("tool_plan"), dict):
+            try:
+                tool_plan = ToolPlanOut.model_validate(obj["tool_plan"])
+            except Exception:
+                tool_plan = None
+
+        return DraftResponse(
+            assistant_message=assistant_message,
+            draft=draft,
+            tool_plan=tool_plan,
+        )
@@ -0,0 +1,229 @@
+"""Prompt building and output parsing shared by the Gemini and Ollama providers."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from localflow.llm.schemas import DraftOut
+
+_ROLES = frozenset(("user", "assistant"))
+
+# Request bodies are serialized with orjson and sent as content=, not httpx's json=.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Characters that matter when matching braces: the scanner jumps between them.
+_JSON_SCAN_RE = re.compile(r'[{}"\\]')
+_LEADING_TITLE_RE = re.compile(r"^\s*(subject|title)\s*[:\-]\s*(.+?)\s*$", re.IGNORECASE)
+# Necessary condition for _LEADING_TITLE_RE on the first non-blank line: after any
+# leading blank lines/whitespace the content starts with "subject" or "title".
+_TITLE_PREFIX_RE = re.compile(r"\s*(?:subject|title)", re.IGNORECASE)
+_MAX_HISTORY_MESSAGES = 24
+_MAX_HISTORY_CHARS = 1600
+
+_GENERAL_ASSISTANT_RULES = (
+    "You are a contextual conversational AI assistant.\n"
+    "Use conversation history to answer naturally across mixed tasks in one thread.\n"
+    "When asked to draft/write content, produce strong draft.content.\n"
+    "When asked a general question, answer directly in assistant_message and include a short supporting draft.\n"
+    "Do not ask unnecessary clarifying questions.\n"
+)
+
+# Constant parts of the prompts, joined once; only history and messages vary per call.
+_PROMPT_TAIL = "\n\n\n\n" + "\n\n".join(
+    [
+        "Return ONLY valid JSON with keys: assistant_message, draft, tool_plan.",
+        "assistant_message must be non-empty and directly answer the latest user message.",
+        "draft must be an object with non-empty content; title may be empty when not needed.",
+        "tool_plan is optional; use null when no concrete tool actions are needed.",
+    ]
+)
+_REPAIR_INSTRUCTIONS = "\n\n".join(
+    [
+        "The previous output was invalid because draft was null or empty.",
+        "You MUST output JSON with a non-null draft object containing non-empty content.",
+        "You MUST keep assistant_message non-empty and relevant to the latest user message.",
+    ]
+)
+
+
+@lru_cache(maxsize=8)
+def _prompt_head(system: str) -> str:
+    return f"{system}\n\n{_GENERAL_ASSISTANT_RULES}\n\nConversation history:\n\n"
+
+
+@lru_cache(maxsize=8)
+def _repair_head(system: str, repair_prompt: str) -> str:
+    return f"{system}\n\n{repair_prompt}\n\n{_GENERAL_ASSISTANT_RULES}\n\nConversation history:\n\n"
+
+def _extract_first_json_object(text: str) -> Optional[str]:
+    """First balanced {...} in text (braces inside JSON strings ignored), in one linear pass."""
+    start = text.find("{") if text else -1
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    for m in _JSON_SCAN_RE.finditer(text, start):
+        i = m.start()
+        if i == escaped_at:
+            continue
+        ch = m.group()
+        if in_string:
+            if ch == "\\":
+                escaped_at = i + 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return None
+
+
+class _JsonObjectWatcher:
+    """
+    Incremental form of _extract_first_json_object for streamed output: feed() the
+    text as it arrives; it returns True once the first {...} object has closed.
+    """
+
+    __slots__ = ("_pos", "_depth", "_started", "_in_string", "_escaped_at")
+
+    def __init__(self) -> None:
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escaped_at = -1
+
+    def feed(self, chunk: str) -> bool:
+        base = self._pos
+        self._pos += len(chunk)
+        for m in _JSON_SCAN_RE.finditer(chunk):
+            i = base + m.start()
+            if i == self._escaped_at:
+                continue
+            ch = m.group()
+            if not self._started:
+                if ch != "{":
+                    continue
+                self._started = True
+            if self._in_string:
+                if ch == "\\":
+                    self._escaped_at = i + 1
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    return True
+        return False
+
+
+def _safe_truncate(s: str, n: int = 900) -> str:
+    s = "" if s is None else str(s)
+    return s if len(s) <= n else s[:n] + "..."
+
+
+def _format_history(history: Optional[List[Dict[str, str]]]) -> str:
+    if not history:
+        return "(no prior messages)"
+
+    lines: List[str] = []
+    append = lines.append
+    for msg in history[-_MAX_HISTORY_MESSAGES:]:
+        role = msg.get("role")
+        if not isinstance(role, str) or role not in _ROLES:
+            role = str(role or "user").strip().lower()
+            if role not in _ROLES:
+                role = "user"
+        content = msg.get("content") or ""
+        if not isinstance(content, str):
+            content = str(content)
+        content = content.strip()
+        if content:
+            if len(content) > _MAX_HISTORY_CHARS:
+                content = content[:_MAX_HISTORY_CHARS] + "..."
+            append(f"{role}: {content}")
+    return "\n".join(lines) if lines else "(no prior messages)"
+
+
+def _synthesize_fallback_draft(assistant_message: str) -> DraftOut:
+    title = "Conversation notes"
+    body = "Summary:\n- [Main point]\n- [Next step]\n"
+
+    if assistant_message and assistant_message.strip():
+        body = f"Assistant response:\n{assistant_message.strip()}\n\n---\n\n{body}"
+
+    return DraftOut(title=title, content=body)
+
+
+def _normalize_title_content(draft: DraftOut) -> DraftOut:
+    content = draft.content or ""
+    # Most drafts have no "Subject:"/"Title:" line; skip splitting them into lines.
+    if not _TITLE_PREFIX_RE.match(content):
+        return draft
+
+    title = (draft.title or "").strip()
+    lines = content.splitlines()
+    if not lines:
+        return draft
+
+    first_idx = 0
+    while first_idx < len(lines) and not lines[first_idx].strip():
+        first_idx += 1
+    if first_idx >= len(lines):
+        return draft
+
+    first_line = lines[first_idx]
+    m = _LEADING_TITLE_RE.match(first_line)
+    if not m:
+        return draft
+
+    extracted = m.group(2).strip()
+    if not extracted:
+        return draft
+
+    if not title:
+        title = extracted
+
+    if title.lower() == extracted.lower():
+        remainder = lines[:first_idx] + lines[first_idx + 1 :]
+        while remainder and not remainder[0].strip():
+            remainder.pop(0)
+        content = "\n".join(remainder).strip()
+
+    draft.title = title
+    draft.content = content
+    return draft
+
+
+def _recover_content_from_assistant_message(assistant_message: str) -> str:
+    text = (assistant_message or "").strip()
+    if not text:
+        return ""
+
+    lower = text.lower()
+    markers = [
+        "here it is:",
+        "draft:",
+        "linkedin post draft:",
+    ]
+    start = -1
+    for marker in markers:
+        idx = lower.find(marker)
+        if idx != -1:
+            start = idx + len(marker)
+            break
+
+    recovered = text[start:].strip() if start != -1 else text
+    return recovered
@@ -1,13 +1,29 @@
 from __future__ import annotations
+import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from ..core.config import settings
 
-@dataclass(frozen=True)
+_PACK_FILES = ("system.txt", "repair.txt")
+
+@dataclass(frozen=True, slots=True)
 class PromptPack:
     system: str
     repair: str
 
+def _read(p: Path) -> str:
+    if not p.exists():
+        raise FileNotFoundError(f"Missing prompt file: {p}")
+    return p.read_text(encoding="utf-8").strip()
+
+@lru_cache(maxsize=8)
+def _load_pack_cached(pack_dir: str, mtimes: tuple[int, ...] | None) -> PromptPack:
+    # Keyed by the files' mtimes as well, so managers for the same directory share
+    # one loaded pack but still see edits made since it was read.
+    d = Path(pack_dir)
+    return PromptPack(system=_read(d / "system.txt"), repair=_read(d / "repair.txt"))
+
 class PromptManager:
     """
     Loads prompts from a directory (prompt pack).
@@ -15,24 +31,33 @@ class PromptManager:
       - prompts are editable without code changes
       - can support multiple packs later
       - cached in memory (loaded once at startup)
+    In dev (ENV=dev) the pack is reloaded when a prompt file's mtime changes, so
+    edits show up without restarting the server; elsewhere it is never re-read.
     """
-    def __init__(self, pack_dir: str | None = None):
+    def __init__(self, pack_dir: str | None = None, *, hot_reload: bool | None = None):
         self.pack_dir = Path(pack_dir or settings.prompt_pack_dir)
-        self.pack: PromptPack = self._load_pack(self.pack_dir)
-
-    def _read(self, p: Path) -> str:
-        if not p.exists():
-            raise FileNotFoundError(f"Missing prompt file: {p}")
-        return p.read_text(encoding="utf-8").strip()
+        self._hot_reload = settings.env == "dev" if hot_reload is None else hot_reload
+        self._pack_key = str(self.pack_dir.resolve())
+        self._mtimes = self._pack_mtimes()
+        self.pack: PromptPack = _load_pack_cached(self._pack_key, self._mtimes)
 
-    def _load_pack(self, pack_dir: Path) -> PromptPack:
-        system = self._read(pack_dir / "system.txt")
-        repair = self._read(pack_dir / "repair.txt")
+    def _pack_mtimes(self) -> tuple[int, ...] | None:
+        try:
+            return tuple(os.stat(self.pack_dir / name).st_mtime_ns for name in _PACK_FILES)
+        except OSError:
+            return None
 
-        return PromptPack(system=system, repair=repair)
+    def _reloaded(self) -> PromptPack:
+        # Stat before reading: an edit landing mid-reload is picked up next call.
+        mtimes = self._pack_mtimes()
+        if mtimes is not None and mtimes != self._mtimes:
+            self.pack = _load_pack_cached(self._pack_key, mtimes)
+            self._mtimes = mtimes
+        return self.pack
 
+    # Called on every draft; without hot reload these are a single attribute hop.
     def get_system(self) -> str:
-        return self.pack.system
+        return (self._reloaded() if self._hot_reload else self.pack).system
 
     def get_repair(self) -> str:
-        return self.pack.repair
+        return (self._reloaded() if self._hot_reload else self.pack).repair
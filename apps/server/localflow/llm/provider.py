@@ -1,10 +1,18 @@
+import hashlib
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 
+import orjson
+from cachetools import TTLCache
+
 from .schemas import DraftResponse
 
 
 class LLMProvider(ABC):
+    # True only when identical prompts give identical drafts (e.g. temperature 0);
+    # CachedLLMProvider passes sampled providers straight through.
+    deterministic: bool = False
+
     @abstractmethod
     async def generate_draft(
         self,
@@ -12,3 +20,57 @@ class LLMProvider(ABC):
         history: Optional[List[Dict[str, str]]] = None,
     ) -> DraftResponse:
         raise NotImplementedError
+
+
+def cache_key(
+    namespace: str, user_message: str, history: Optional[List[Dict[str, str]]], prompt: str = ""
+) -> str:
+    h = hashlib.sha256()
+    h.update(namespace.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(prompt.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(orjson.dumps(history or [], option=orjson.OPT_SORT_KEYS))
+    h.update(b"\x00")
+    h.update((user_message or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+class CachedLLMProvider(LLMProvider):
+    """
+    Wraps a provider with an in-memory TTL cache keyed on (provider/model, prompt pack,
+    history, message). Identical prompts return the previous DraftResponse instead of
+    a new LLM round-trip; editing the prompt pack (hot-reloaded in dev) misses.
+    Providers that sample (inner.deterministic is false) are never cached: a repeated
+    prompt must be able to produce a different draft.
+    """
+
+    def __init__(self, inner, *, maxsize: int = 1000, ttl_s: float = 3600.0) -> None:
+        self._inner = inner
+        model = getattr(inner, "_model", "")
+        self._namespace = f"{type(inner).__name__}:{model}"
+        self._pm = getattr(inner, "_pm", None)
+        self._enabled = bool(getattr(inner, "deterministic", False))
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_s)
+        self.hits = 0
+        self.misses = 0
+
+    async def generate_draft(
+        self,
+        user_message: str,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> DraftResponse:
+        if not self._enabled:
+            return await self._inner.generate_draft(user_message=user_message, history=history)
+        pm = self._pm
+        prompt = f"{pm.get_system()}\x00{pm.get_repair()}" if pm is not None else ""
+        key = cache_key(self._namespace, user_message, history, prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached.model_copy(deep=True)
+
+        self.misses += 1
+        out = await self._inner.generate_draft(user_message=user_message, history=history)
+        self._cache[key] = out.model_copy(deep=True)
+        return out
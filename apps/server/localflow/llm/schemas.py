@@ -1,26 +1,31 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import Any, Optional
+from pydantic import BaseModel, Field, ConfigDict, InstanceOf, TypeAdapter, field_validator
 
 
 class ToolActionOut(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
     tool: str
-    params: Dict[str, Any] = Field(default_factory=dict)
+    # Opaque until tool dispatch: checked to be a dict (in pydantic-core, no copy)
+    # but its keys and values are not walked.
+    params: InstanceOf[dict] = Field(default_factory=dict)
 
 
 class ToolPlanOut(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
-    actions: List[ToolActionOut] = Field(default_factory=list)
+    actions: list[ToolActionOut] = Field(default_factory=list)
 
-    @field_validator("actions")
+    @field_validator("actions", mode="before")
     @classmethod
-    def cap_actions(cls, v: List[ToolActionOut]) -> List[ToolActionOut]:
-        # safety: avoid huge tool plans
-        return v[:10]
+    def cap_actions(cls, v: Any) -> Any:
+        # safety: avoid huge tool plans. Capped before validation, so actions past the
+        # tenth are never validated (max_length would reject the plan instead).
+        if isinstance(v, (list, tuple)) and len(v) > 10:
+            return v[:10]
+        return v
 
 
 class DraftOut(BaseModel):
@@ -54,4 +59,8 @@ class DraftResponse(BaseModel):
     def normalize_assistant_message(cls, v: str) -> str:
         if v is None:
             return ""
-        return str(v)
\ No newline at end of file
+        return str(v)
+
+
+# The one validator for LLM output, built once at import rather than per call site.
+DRAFT_ADAPTER: TypeAdapter[DraftResponse] = TypeAdapter(DraftResponse)
@@ -1,24 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import logging
 from contextlib import asynccontextmanager
 
 import httpx
+import orjson
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
 from localflow.api.router import router as api_router
-from localflow.core.config import Settings
-from localflow.llm.gemini import GeminiProvider
-from localflow.llm.ollama import OllamaProvider
+from localflow.core.config import settings
+from localflow.core.logging import configure_logging, stop_logging
+from localflow.core.middleware import CorrelationIdMiddleware, LocalCORSMiddleware
 from localflow.llm.prompt_manager import PromptManager
-from localflow.rag import RagService
+from localflow.llm.provider import CachedLLMProvider
+from localflow.rag import NullRagService, RagService
 from localflow.tools import build_registry
 
 log = logging.getLogger("localflow")
 
+# HTTP/2 needs the optional h2 package (pip install -e ".[http2]").
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -26,44 +32,56 @@ async def lifespan(app: FastAPI):
     Create and store app-wide singletons here.
     Windows-first dev: keep things deterministic and easy to reason about.
     """
-    settings = Settings()
+    configure_logging()
+
+    # The process-wide settings from core.config (read once at import, like the
+    # modules that use it directly); no second Settings() parse here.
     app.state.settings = settings
 
-    # Shared HTTP client for Ollama + future connectors
-    http_client = httpx.AsyncClient(timeout=httpx.Timeout(120.0))
+    # Shared HTTP client for Ollama + future connectors: keep-alive pool sized for
+    # concurrent chats, fail fast on connect/pool waits, HTTP/2 to Gemini when available.
+    # HTTP/2 is only negotiated over TLS, so plain-http Ollama stays on HTTP/1.1 with
+    # the same pool. With an explicit transport, pool limits and http2 belong to it;
+    # retries=1 re-attempts failed connects only, never a sent request.
+    http_client = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30.0),
+            retries=1,
+        ),
+        timeout=httpx.Timeout(float(settings.llm_timeout_s), connect=5.0, write=10.0, pool=5.0),
+    )
     app.state.http_client = http_client
 
     # Prompt pack manager (no hardcoded prompt logic in code)
-    # Settings should point at the prompt pack directory (e.g. .../prompt_packs/default)
-    # If your Settings uses a different field name, adjust it here.
-    prompt_dir = getattr(settings, "prompt_pack_dir", None) or getattr(
-        settings, "prompt_pack_path", None
-    ) or getattr(settings, "prompt_pack", None)
-    if not prompt_dir:
-        # Fallback to the default pack path relative to package if settings not present.
-        # (Keeps server booting in dev.)
-        prompt_dir = "localflow/llm/prompt_packs/default"
+    app.state.prompt_manager = PromptManager(settings.prompt_pack_dir)
 
-    app.state.prompt_manager = PromptManager(prompt_dir)
-
-    # Tool registry (gated execution later)
-    app.state.tool_registry = build_registry()
+    # Tool registry (gated execution later); search_web uses the shared HTTP client.
+    app.state.tool_registry = build_registry(http_client)
 
     # Local RAG service (permissioned local file retrieval)
-    app.state.rag_service = RagService(
-        store_dir=getattr(settings, "rag_store_dir", ".localflow_rag"),
-        chunk_size=int(getattr(settings, "rag_chunk_size", 1200)),
-        chunk_overlap=int(getattr(settings, "rag_chunk_overlap", 200)),
-        embedding_dim=int(getattr(settings, "rag_embedding_dim", 384)),
-    )
+    if settings.rag_enabled:
+        app.state.rag_service = RagService(
+            store_dir=settings.rag_store_dir,
+            chunk_size=settings.rag_chunk_size,
+            chunk_overlap=settings.rag_chunk_overlap,
+            embedding_dim=settings.rag_embedding_dim,
+            search_cache_maxsize=settings.rag_search_cache_maxsize,
+            search_cache_ttl_s=float(settings.rag_search_cache_ttl_s),
+        )
+    else:
+        app.state.rag_service = NullRagService()
 
     # LLM provider (swappable)
-    provider = (getattr(settings, "llm_provider", "ollama") or "ollama").strip().lower()
-    timeout_s = float(getattr(settings, "llm_timeout_s", 120))
+    provider = (settings.llm_provider or "ollama").strip().lower()
+    timeout_s = float(settings.llm_timeout_s)
 
+    # Provider modules are imported only for the provider in use.
     if provider == "gemini":
-        api_key = getattr(settings, "gemini_api_key", None)
-        model = getattr(settings, "gemini_model", None)
+        from localflow.llm.gemini import GeminiProvider
+
+        api_key = settings.gemini_api_key
+        model = settings.gemini_model
         if not api_key:
             raise RuntimeError("gemini_api_key is not configured. Set it in Settings / env.")
         if not model:
@@ -76,8 +94,10 @@ async def lifespan(app: FastAPI):
             timeout_s=timeout_s,
         )
     elif provider == "ollama":
-        base_url = getattr(settings, "ollama_base_url", "http://127.0.0.1:11434")
-        model = getattr(settings, "ollama_model", None)
+        from localflow.llm.ollama import OllamaProvider
+
+        base_url = settings.ollama_base_url
+        model = settings.ollama_model
         if not model:
             raise RuntimeError("ollama_model is not configured. Set it in Settings / env.")
         app.state.llm_provider = OllamaProvider(
@@ -90,47 +110,60 @@ async def lifespan(app: FastAPI):
     else:
         raise RuntimeError(f"Unsupported llm_provider: {provider}")
 
+    # Connect to the provider in the background while the app finishes starting.
+    warmup = asyncio.create_task(app.state.llm_provider.warm_up())
+
+    if settings.llm_cache_enabled:
+        app.state.llm_provider = CachedLLMProvider(
+            app.state.llm_provider,
+            maxsize=settings.llm_cache_maxsize,
+            ttl_s=float(settings.llm_cache_ttl_s),
+        )
+
     try:
         yield
     finally:
+        warmup.cancel()
         await http_client.aclose()
+        stop_logging()
 
 
-app = FastAPI(title="LocalFlow Assistant", lifespan=lifespan)
+_ERROR_CODES: dict[int, str] = {
+    400: "INVALID_REQUEST",
+    401: "UNAUTHORIZED",
+    403: "FORBIDDEN",
+    404: "NOT_FOUND",
+    409: "CONFLICT",
+    422: "VALIDATION_ERROR",
+}
 
 
 def _error_code(status_code: int) -> str:
-    if status_code == 400:
-        return "INVALID_REQUEST"
-    if status_code == 401:
-        return "UNAUTHORIZED"
-    if status_code == 403:
-        return "FORBIDDEN"
-    if status_code == 404:
-        return "NOT_FOUND"
-    if status_code == 409:
-        return "CONFLICT"
-    if status_code == 422:
-        return "VALIDATION_ERROR"
-    if status_code >= 500:
-        return "INTERNAL_ERROR"
-    return "ERROR"
-
-
-@app.exception_handler(HTTPException)
+    code = _ERROR_CODES.get(status_code)
+    if code is not None:
+        return code
+    return "INTERNAL_ERROR" if status_code >= 500 else "ERROR"
+
+
+def _error_response(status_code: int, content: dict) -> Response:
+    # Validation errors can carry non-JSON values (exceptions in ctx, raw bytes input);
+    # default=str renders them instead of failing the error response itself.
+    return Response(
+        content=orjson.dumps(content, default=str),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 async def http_exception_handler(_: Request, exc: HTTPException):
     detail = exc.detail if isinstance(exc.detail, str) else str(exc.detail)
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": detail, "error_code": _error_code(exc.status_code)},
-    )
+    return _error_response(exc.status_code, {"detail": detail, "error_code": _error_code(exc.status_code)})
 
 
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(_: Request, exc: RequestValidationError):
-    return JSONResponse(
-        status_code=422,
-        content={
+    return _error_response(
+        422,
+        {
             "detail": "Validation error",
             "error_code": _error_code(422),
             "errors": exc.errors(),
@@ -138,33 +171,45 @@ async def validation_exception_handler(_: Request, exc: RequestValidationError):
     )
 
 
-@app.exception_handler(ValueError)
 async def value_error_handler(_: Request, exc: ValueError):
-    return JSONResponse(
-        status_code=400,
-        content={"detail": str(exc), "error_code": _error_code(400)},
-    )
+    return _error_response(400, {"detail": str(exc), "error_code": _error_code(400)})
+
 
+# Constant body, serialized once. async def keeps the route off the threadpool.
+_ROOT_BODY = orjson.dumps({"ok": True, "hint": "Try /v1/health"})
 
-# Dev CORS for Vite
-settings_for_cors = Settings()
-dev_origins = getattr(settings_for_cors, "cors_origins", None) or [
-    "http://localhost:5173",
-    "http://127.0.0.1:5173",
-]
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=dev_origins,
-    allow_origin_regex=r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$",
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
+async def root():
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+
+def create_app() -> FastAPI:
+    """
+    Build the ASGI app. Importing this module only defines things; the singletons
+    (HTTP client, providers, RAG) are created by lifespan when the app starts.
+    """
+    app = FastAPI(title="LocalFlow Assistant", lifespan=lifespan)
+
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+
+    app.add_middleware(CorrelationIdMiddleware)
+
+    # Dev CORS for Vite
+    app.add_middleware(
+        LocalCORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_origin_regex=r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$",
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
-@app.get("/")
-def root():
-    return {"ok": True, "hint": "Try /v1/health"}
+    app.add_api_route("/", root, methods=["GET"])
+    app.include_router(api_router)
+    return app
 
 
-app.include_router(api_router)
+# Entrypoint for uvicorn (localflow.main:app).
+app = create_app()
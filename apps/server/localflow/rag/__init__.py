@@ -1,4 +1,4 @@
-from .service import RagService
+from .service import NullRagService, RagService
 
-__all__ = ["RagService"]
+__all__ = ["NullRagService", "RagService"]
 
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+
+log = logging.getLogger("localflow.rag")
+
+DEFAULT_RERANK_MODEL = "ms-marco-MiniLM-L-12-v2"
+
+
+class Reranker:
+    """
+    Cross-encoder reranking of retrieved passages via FlashRank (ONNX, CPU).
+    FlashRank is optional; use get_reranker() rather than constructing this directly.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_RERANK_MODEL, cache_dir: str | None = None) -> None:
+        try:
+            from flashrank import Ranker
+        except Exception as e:  # pragma: no cover
+            raise RuntimeError("FlashRank is not installed. Install 'flashrank' to enable reranking.") from e
+        self.model_name = model_name
+        # The first use downloads the model into cache_dir; offline, an HTTP error or an
+        # unwritable directory all end up here.
+        kwargs = {"cache_dir": cache_dir} if cache_dir else {}
+        try:
+            self._ranker = Ranker(model_name=model_name, **kwargs)
+        except Exception as e:
+            raise RuntimeError(f"Could not load reranker model {model_name!r}: {e}") from e
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        """Relevance of each passage to the query, in the order the passages were given."""
+        from flashrank import RerankRequest
+
+        results = self._ranker.rerank(
+            RerankRequest(query=query, passages=[{"id": i, "text": text} for i, text in enumerate(passages)])
+        )
+        scores = [0.0] * len(passages)
+        for item in results:
+            scores[int(item["id"])] = float(item["score"])
+        return scores
+
+
+@lru_cache(maxsize=1)
+def get_reranker(cache_dir: str | None = None) -> Reranker | None:
+    """
+    Process-wide reranker (the ONNX session is built once), or None without FlashRank
+    or its model. A failure is cached too: logged once, not retried on every search.
+    """
+    try:
+        return Reranker(cache_dir=cache_dir)
+    except RuntimeError as e:
+        log.warning("Reranking disabled: %s", e)
+        return None
@@ -1,13 +1,48 @@
 from __future__ import annotations
 
+import copy
+import heapq
 import json
 import math
+import multiprocessing
 import os
 import re
-from dataclasses import dataclass
+import stat
+import threading
+import zlib
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from itertools import repeat
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, Literal, Sequence
+
+import numpy as np
+from cachetools import TTLCache
+
+from .reranker import get_reranker
+
+RetrievalMode = Literal["semantic", "bm25", "hybrid"]
+
+# Okapi BM25 parameters and the Reciprocal Rank Fusion constant (Cormack et al. 2009).
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+_RRF_K = 60
+
+# How long list_available_drives() and the index part of status() are reused;
+# UIs poll both every few seconds.
+_POLL_CACHE_TTL_S = 5.0
+
+# rebuild_index spreads files over worker processes only when each gets at least this
+# many; below that, starting the processes costs more than it saves.
+_INDEX_FILES_PER_WORKER = 64
+_INDEX_MAX_WORKERS = 8
+
+# Distinct root sets whose matching index rows are kept per loaded index.
+_ROWS_UNDER_CACHE_SIZE = 32
 
 
 def utc_iso() -> str:
@@ -18,49 +53,98 @@ def _norm_path(path: str) -> str:
     return str(Path(path).expanduser().resolve())
 
 
+def _entry_path(entry: os.DirEntry) -> str:
+    # Roots are already resolved and the walk never enters symlinked directories, so
+    # only a symlinked file itself still needs resolving.
+    return _norm_path(entry.path) if entry.is_symlink() else entry.path
+
+
+def _suffix(name: str) -> str:
+    """Path(name).suffix for a bare file name, without building a Path."""
+    dot = name.rfind(".")
+    return name[dot:] if 0 < dot < len(name) - 1 else ""
+
+
+def _with_sep(p: str) -> str:
+    return p if p.endswith(os.sep) else p + os.sep
+
+
+def _root_prefixes(roots: Iterable[str]) -> list[str]:
+    """
+    Resolved roots as sorted, case-normalized prefixes ending in a separator, without
+    roots that lie inside another one (so at most one prefix can match a path).
+    """
+    prefixes: list[str] = []
+    for r in sorted({_with_sep(os.path.normcase(_norm_path(r))) for r in roots}):
+        if not prefixes or not r.startswith(prefixes[-1]):
+            prefixes.append(r)
+    return prefixes
+
+
+def _under_prefixes(path: str, prefixes: Sequence[str]) -> bool:
+    """
+    True if the resolved path is one of the roots behind prefixes or inside one;
+    a bisect over the sorted prefixes instead of a check per root.
+    """
+    p = _with_sep(os.path.normcase(path))
+    i = bisect_right(prefixes, p) - 1
+    return i >= 0 and p.startswith(prefixes[i])
+
+
+_TOKEN_RE = re.compile(r"[a-zA-Z0-9_]{2,}")
+# Every byte but ASCII a-z and 0-9. Non-ASCII characters encode to bytes >= 0x80 only,
+# so deleting these from the UTF-8 bytes drops exactly the characters [^a-z0-9] matches.
+_COMPACT_DELETE = bytes(b for b in range(256) if not (0x61 <= b <= 0x7A or 0x30 <= b <= 0x39))
+_DRIVE_RE = re.compile(r"\b([a-zA-Z]):\b")
+
+
 def _tokenize(text: str) -> list[str]:
-    return re.findall(r"[a-zA-Z0-9_]{2,}", (text or "").lower())
-
-
-_QUERY_STOPWORDS = {
-    "find",
-    "search",
-    "locate",
-    "where",
-    "is",
-    "are",
-    "the",
-    "a",
-    "an",
-    "of",
-    "for",
-    "in",
-    "on",
-    "to",
-    "my",
-    "local",
-    "pc",
-    "computer",
-    "disk",
-    "drive",
-    "file",
-    "files",
-    "folder",
-    "folders",
-    "directory",
-    "document",
-    "documents",
-}
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+_QUERY_STOPWORDS = frozenset(
+    {
+        "find",
+        "search",
+        "locate",
+        "where",
+        "is",
+        "are",
+        "the",
+        "a",
+        "an",
+        "of",
+        "for",
+        "in",
+        "on",
+        "to",
+        "my",
+        "local",
+        "pc",
+        "computer",
+        "disk",
+        "drive",
+        "file",
+        "files",
+        "folder",
+        "folders",
+        "directory",
+        "document",
+        "documents",
+    }
+)
 
 
 def _compact(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", (s or "").lower())
+    # bytes.translate rather than a regex sub: this runs for every path find_files walks.
+    # surrogatepass keeps undecodable file name bytes (lone surrogates) encodable.
+    return (s or "").lower().encode("utf-8", "surrogatepass").translate(None, _COMPACT_DELETE).decode("ascii")
 
 
 def _extract_drive_hints(query: str) -> list[str]:
     seen: set[str] = set()
     out: list[str] = []
-    for m in re.findall(r"\b([a-zA-Z]):\b", query or ""):
+    for m in _DRIVE_RE.findall(query or ""):
         drive = f"{m.upper()}:\\"
         if drive not in seen:
             seen.add(drive)
@@ -68,16 +152,166 @@ def _extract_drive_hints(query: str) -> list[str]:
     return out
 
 
-def _normalize(vec: list[float]) -> list[float]:
-    norm = math.sqrt(sum(v * v for v in vec))
-    if norm <= 0:
-        return vec
-    return [v / norm for v in vec]
+@dataclass
+class _Bm25Postings:
+    """Per index row term totals, and per term the rows containing it with their counts."""
+
+    lengths: np.ndarray  # int64, sum of each row's term counts
+    postings: dict[str, tuple[np.ndarray, np.ndarray]]  # term -> (rows, counts as float64)
 
 
-def _dot(a: list[float], b: list[float]) -> float:
-    n = min(len(a), len(b))
-    return sum(a[i] * b[i] for i in range(n))
+def _bm25_postings(terms: list[dict]) -> _Bm25Postings:
+    rows_of: dict[str, list[int]] = {}
+    counts_of: dict[str, list] = {}
+    for j, doc in enumerate(terms):
+        for term, tf in doc.items():
+            rows = rows_of.get(term)
+            if rows is None:
+                rows_of[term] = [j]
+                counts_of[term] = [tf]
+            else:
+                rows.append(j)
+                counts_of[term].append(tf)
+    return _Bm25Postings(
+        lengths=np.array([sum(d.values()) for d in terms], dtype=np.int64),
+        postings={
+            term: (np.array(rows, dtype=np.intp), np.array(counts_of[term], dtype=np.float64))
+            for term, rows in rows_of.items()
+        },
+    )
+
+
+@dataclass
+class _Bm25View:
+    """BM25 statistics of one set of rows (doc i is index row rows[i])."""
+
+    doc_of_row: np.ndarray  # intp per index row: its doc number, or -1 if not in the set
+    norm: np.ndarray  # float64 per doc: k1 * (1 - b + b * length / avgdl)
+
+
+def _bm25_view(postings: _Bm25Postings, rows: np.ndarray) -> _Bm25View:
+    doc_of_row = np.full(len(postings.lengths), -1, dtype=np.intp)
+    doc_of_row[rows] = np.arange(len(rows), dtype=np.intp)
+    lengths = postings.lengths[rows]
+    avg_len = (int(lengths.sum()) / len(rows)) if len(rows) else 0.0
+    norm = _BM25_K1 * (1.0 - _BM25_B + _BM25_B * lengths / (avg_len or 1.0))
+    return _Bm25View(doc_of_row=doc_of_row, norm=norm)
+
+
+def _bm25_scores(query_terms: Iterable[str], postings: _Bm25Postings, view: _Bm25View) -> np.ndarray:
+    """BM25 score of every doc in view against the query terms; only their postings are read."""
+    n = len(view.norm)
+    scores = np.zeros(n, dtype=np.float64)
+    for term in set(query_terms):
+        entry = postings.postings.get(term)
+        if entry is None:
+            continue
+        docs = view.doc_of_row[entry[0]]
+        inside = docs >= 0
+        docs = docs[inside]
+        df = len(docs)
+        if not df:
+            continue
+        weight = math.log((n - df + 0.5) / (df + 0.5) + 1.0)
+        tf = entry[1][inside]
+        scores[docs] += weight * tf * (_BM25_K1 + 1.0) / (tf + view.norm[docs])
+    return scores
+
+
+def _rrf_fuse(*rankings: list[tuple[float, int]]) -> list[tuple[float, int]]:
+    """Reciprocal Rank Fusion of (score, doc) lists that are already sorted best-first."""
+    fused: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (_, doc) in enumerate(ranking, start=1):
+            fused[doc] = fused.get(doc, 0.0) + 1.0 / (_RRF_K + rank)
+    return [(score, doc) for doc, score in fused.items()]
+
+
+def _read_text(path: str, st: os.stat_result, max_bytes: int = 1_500_000) -> str:
+    """
+    Contents of the file st describes, decoded as UTF-8 with newlines translated the
+    way text mode does; "" if it isn't a regular file, is too large or can't be read.
+    """
+    if not stat.S_ISREG(st.st_mode) or st.st_size > max_bytes:
+        return ""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            # Sized from st, so no read buffer of max_bytes; one read returns a regular
+            # file's whole contents (one byte more shows it has grown past st).
+            data = os.read(fd, st.st_size + 1)
+        finally:
+            os.close(fd)
+    except OSError:
+        return ""
+    if len(data) > max_bytes:
+        return ""
+    text = data.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> list[str]:
+    s = (text or "").strip()
+    if not s:
+        return []
+    if len(s) <= chunk_size:
+        return [s]
+    out: list[str] = []
+    step = chunk_size - chunk_overlap
+    i = 0
+    while i < len(s):
+        chunk = s[i : i + chunk_size].strip()
+        if chunk:
+            out.append(chunk)
+        i += step
+    return out
+
+
+def _embed_counts(counts: Counter, dim: int) -> np.ndarray:
+    """L2-normalized hashed bag of words over the given term counts."""
+    # crc32 rather than hash(): str hashes are salted per process, which would put
+    # a query's tokens in other buckets than the index built by an earlier run.
+    idxs = np.fromiter((zlib.crc32(tok.encode()) % dim for tok in counts), dtype=np.intp, count=len(counts))
+    vals = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    vec = np.bincount(idxs, weights=vals, minlength=dim)
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec /= norm
+    return vec.astype(np.float32)
+
+
+def _index_file(path: str, chunk_size: int, chunk_overlap: int, embedding_dim: int) -> tuple[list[dict], np.ndarray]:
+    """
+    Index rows and their (n_chunks, embedding_dim) embeddings for one file; no rows
+    when it has no text. Module-level so rebuild_index can run it in worker processes.
+    """
+    try:
+        st = os.stat(path)
+        chunks = _chunk_text(_read_text(path, st), chunk_size, chunk_overlap)
+    except OSError:
+        chunks = []
+    if not chunks:
+        return [], np.empty((0, embedding_dim), dtype=np.float32)
+    mtime = st.st_mtime
+    rows: list[dict] = []
+    vectors = np.empty((len(chunks), embedding_dim), dtype=np.float32)
+    for idx, chunk in enumerate(chunks):
+        counts = Counter(_tokenize(chunk))
+        rows.append(
+            {
+                "id": f"{path}::{idx}",
+                "path": path,
+                "mtime": mtime,
+                "chunk_index": idx,
+                "snippet": chunk[:700],
+                # Term counts of the whole chunk for BM25, not just the snippet.
+                "terms": dict(counts),
+            }
+        )
+        vectors[idx] = _embed_counts(counts, embedding_dim)
+    return rows, vectors
 
 
 @dataclass
@@ -87,12 +321,41 @@ class RagHit:
     snippet: str
 
 
+@dataclass
+class _IndexData:
+    """The usable rows of index.jsonl, column-wise, with embeddings packed into one matrix."""
+
+    stamp: tuple  # (st_mtime_ns, st_size) of index.jsonl and embeddings.f32 when read
+    paths: list[str]
+    snippets: list[str]
+    terms: list[dict]
+    matrix: np.ndarray  # float32, shape (len(paths), embedding_dim)
+    # Row numbers under each set of root prefixes searched so far (see _rows_under).
+    rows_under: dict[tuple[str, ...], np.ndarray] = field(default_factory=dict)
+    # BM25 postings, built on the first lexical search, and statistics per root set.
+    bm25: _Bm25Postings | None = None
+    bm25_under: dict[tuple[str, ...], _Bm25View] = field(default_factory=dict)
+
+
+def _top_scores(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k best positive scores, best first; equal scores keep their
+    original order (the same result as a stable descending sort, sliced to k).
+    """
+    idx = np.flatnonzero(scores > 0)
+    if len(idx) > k:
+        kth = np.partition(scores[idx], len(idx) - k)[len(idx) - k]
+        idx = idx[scores[idx] >= kth]
+    return idx[np.lexsort((idx, -scores[idx]))][:k]
+
+
 class RagService:
     """
     Minimal local-first RAG service:
     - User-approved folder permissions
     - Local chunk index on disk (JSONL)
     - Lightweight local embeddings via hashed token vectors
+    - BM25 over per-chunk term counts, fused with the embeddings via RRF
     """
 
     def __init__(
@@ -102,12 +365,32 @@ class RagService:
         chunk_size: int = 1200,
         chunk_overlap: int = 200,
         embedding_dim: int = 384,
+        search_cache_maxsize: int = 512,
+        search_cache_ttl_s: float = 120.0,
     ) -> None:
         self.store_dir = Path(store_dir)
         self.store_dir.mkdir(parents=True, exist_ok=True)
         self.permissions_path = self.store_dir / "permissions.json"
         self.index_path = self.store_dir / "index.jsonl"
         self.meta_path = self.store_dir / "index_meta.json"
+        # Raw float32 (chunks_indexed, embedding_dim) matrix, row i belonging to line i of
+        # index.jsonl; memory-mapped on load instead of parsed from JSON.
+        self.embeddings_path = self.store_dir / "embeddings.f32"
+        # (stamp, approved roots) as last read from permissions.json, stamp being the
+        # file's (st_mtime_ns, st_size). Reread when the stamp changes, e.g. after another
+        # server process granted or revoked a root; our own writes drop it outright.
+        self._permissions_cache: tuple[tuple, tuple[str, ...]] | None = None
+        # Recent search() results; dropped whenever permissions or the index change.
+        # Handlers run in worker threads, hence the lock (shared with _poll_cache).
+        self._search_cache: TTLCache | None = (
+            TTLCache(maxsize=search_cache_maxsize, ttl=search_cache_ttl_s) if search_cache_maxsize > 0 else None
+        )
+        self._cache_lock = threading.Lock()
+        # Drive list and index meta for the polled endpoints, kept for a few seconds.
+        # The index meta is dropped as soon as rebuild_index writes a new one.
+        self._poll_cache: TTLCache = TTLCache(maxsize=8, ttl=_POLL_CACHE_TTL_S)
+        # index.jsonl parsed once and reused until the file changes (see _load_index).
+        self._index_data: _IndexData | None = None
         self.chunk_size = max(400, chunk_size)
         self.chunk_overlap = max(50, min(chunk_overlap, self.chunk_size // 2))
         self.embedding_dim = max(128, embedding_dim)
@@ -186,28 +469,57 @@ class RagService:
     def _write_json(self, path: Path, obj: dict) -> None:
         path.write_text(json.dumps(obj, ensure_ascii=True, indent=2), encoding="utf-8")
 
+    def _write_permissions(self, obj: dict) -> None:
+        self._write_json(self.permissions_path, obj)
+        self._permissions_cache = None
+        self._clear_search_cache()
+
+    def _clear_search_cache(self) -> None:
+        if self._search_cache is not None:
+            with self._cache_lock:
+                self._search_cache.clear()
+
     def _load_permissions(self) -> list[str]:
+        try:
+            st = self.permissions_path.stat()
+            stamp: tuple = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = ()
+        cached = self._permissions_cache
+        if cached is not None:
+            if cached[0] == stamp:
+                return list(cached[1])
+            # Changed behind our back: results cached under the old roots are stale too.
+            self._clear_search_cache()
         data = self._read_json(self.permissions_path, {"roots": []})
         roots = data.get("roots")
         if not isinstance(roots, list):
-            return []
+            roots = []
         out: list[str] = []
         for root in roots:
             if isinstance(root, dict) and isinstance(root.get("path"), str):
                 out.append(_norm_path(root["path"]))
             elif isinstance(root, str):
                 out.append(_norm_path(root))
-        return sorted(set(out))
+        approved = sorted(set(out))
+        self._permissions_cache = (stamp, tuple(approved))
+        return approved
 
     def list_permissions(self) -> list[str]:
         return self._load_permissions()
 
     def list_available_drives(self) -> list[str]:
+        with self._cache_lock:
+            cached = self._poll_cache.get("drives")
+        if cached is not None:
+            return list(cached)
         drives: list[str] = []
         for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
             p = f"{c}:\\"
             if os.path.exists(p):
                 drives.append(p)
+        with self._cache_lock:
+            self._poll_cache["drives"] = tuple(drives)
         return drives
 
     def is_path_allowed(self, path: str) -> bool:
@@ -225,8 +537,7 @@ class RagService:
                 raise ValueError(f"Path must be an existing directory: {root}")
             if p not in cleaned:
                 cleaned.append(p)
-        self._write_json(
-            self.permissions_path,
+        self._write_permissions(
             {"roots": [{"path": p, "granted_at": utc_iso()} for p in cleaned]},
         )
         return cleaned
@@ -270,87 +581,84 @@ class RagService:
                 cleaned[_norm_path(item["path"])] = item
         if root not in cleaned:
             cleaned[root] = {"path": root, "granted_at": utc_iso()}
-        self._write_json(self.permissions_path, {"roots": list(cleaned.values())})
+        self._write_permissions({"roots": list(cleaned.values())})
         return sorted(cleaned.keys())
 
     def revoke_permission(self, path: str) -> list[str]:
         root = _norm_path(path)
         current = self._load_permissions()
         kept = [p for p in current if p != root]
-        self._write_json(
-            self.permissions_path,
+        self._write_permissions(
             {"roots": [{"path": p, "granted_at": utc_iso()} for p in kept]},
         )
         return kept
 
     def _is_under_root(self, path: str, root: str) -> bool:
-        try:
-            return Path(path).resolve().is_relative_to(Path(root).resolve())
-        except Exception:
-            p = _norm_path(path).lower()
-            r = _norm_path(root).lower().rstrip("\\/")
-            return p == r or p.startswith(r + os.sep)
+        # Callers pass both already resolved (_norm_path), so no filesystem access here;
+        # normcase keeps the comparison case-insensitive on Windows only, like Path does.
+        return _with_sep(os.path.normcase(path)).startswith(_with_sep(os.path.normcase(root)))
+
+    def _walk(self, root: str) -> Iterable[os.DirEntry]:
+        """
+        File entries under root in os.walk order, skipping ignored and symlinked
+        directories and any directory that can't be listed.
+        """
+        stack = [root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            subdirs: list[str] = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield entry
+                elif entry.name.lower() not in self.ignored_dirs and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            stack.extend(reversed(subdirs))
 
     def _iter_files(self, roots: Iterable[str], max_files: int) -> Iterable[str]:
         count = 0
         for root in roots:
-            for dirpath, dirnames, filenames in os.walk(root):
-                dirnames[:] = [d for d in dirnames if d.lower() not in self.ignored_dirs]
-                for fname in filenames:
-                    ext = Path(fname).suffix.lower()
-                    if ext not in self.allowed_ext:
-                        continue
-                    full = _norm_path(os.path.join(dirpath, fname))
-                    yield full
-                    count += 1
-                    if count >= max_files:
-                        return
+            for entry in self._walk(root):
+                if _suffix(entry.name).lower() not in self.allowed_ext:
+                    continue
+                yield _entry_path(entry)
+                count += 1
+                if count >= max_files:
+                    return
 
     def _iter_all_files(self, roots: Iterable[str], max_files: int) -> Iterable[str]:
         count = 0
         for root in roots:
-            for dirpath, dirnames, filenames in os.walk(root):
-                dirnames[:] = [d for d in dirnames if d.lower() not in self.ignored_dirs]
-                for fname in filenames:
-                    full = _norm_path(os.path.join(dirpath, fname))
-                    yield full
-                    count += 1
-                    if count >= max_files:
-                        return
-
-    def _read_text(self, path: str, max_bytes: int = 1_500_000) -> str:
-        p = Path(path)
-        if not p.exists() or not p.is_file():
-            return ""
-        if p.stat().st_size > max_bytes:
-            return ""
-        try:
-            return p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            return ""
+            for entry in self._walk(root):
+                yield _entry_path(entry)
+                count += 1
+                if count >= max_files:
+                    return
 
-    def _chunk_text(self, text: str) -> list[str]:
-        s = (text or "").strip()
-        if not s:
-            return []
-        if len(s) <= self.chunk_size:
-            return [s]
-        out: list[str] = []
-        step = self.chunk_size - self.chunk_overlap
-        i = 0
-        while i < len(s):
-            chunk = s[i : i + self.chunk_size].strip()
-            if chunk:
-                out.append(chunk)
-            i += step
-        return out
+    def _embed(self, text: str) -> np.ndarray:
+        return _embed_counts(Counter(_tokenize(text)), self.embedding_dim)
 
-    def _embed(self, text: str) -> list[float]:
-        vec = [0.0] * self.embedding_dim
-        for tok in _tokenize(text):
-            idx = hash(tok) % self.embedding_dim
-            vec[idx] += 1.0
-        return _normalize(vec)
+    def _index_files(self, paths: list[str]) -> Iterator[tuple[list[dict], np.ndarray]]:
+        """_index_file results for paths, in order."""
+        args = (self.chunk_size, self.chunk_overlap, self.embedding_dim)
+        workers = min(_INDEX_MAX_WORKERS, os.cpu_count() or 1, len(paths) // _INDEX_FILES_PER_WORKER)
+        if workers <= 1:
+            for path in paths:
+                yield _index_file(path, *args)
+            return
+        # Reading, chunking and embedding hold the GIL, so files go to worker
+        # processes; map() hands results back in path order. Spawned, not forked (as on
+        # Windows): the server has threads running (logging, Playwright, anyio workers)
+        # whose locks a forked child could inherit held.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            yield from pool.map(_index_file, paths, *(repeat(a) for a in args), chunksize=16)
 
     def rebuild_index(self, *, roots: list[str] | None = None, max_files: int = 1500) -> dict:
         allowed = self._load_permissions()
@@ -366,32 +674,28 @@ class RagService:
         if not roots_to_use:
             raise ValueError("No approved roots. Grant folder permission first.")
 
-        rows: list[dict] = []
+        paths = list(self._iter_files(roots_to_use, max_files=max_files))
+        # Each file's rows and embeddings go straight to disk as its results come in; the
+        # new files only replace the current index once every file has been processed.
+        index_tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        embeddings_tmp = self.embeddings_path.with_name(self.embeddings_path.name + ".tmp")
         files_indexed = 0
         chunks_indexed = 0
-        for path in self._iter_files(roots_to_use, max_files=max_files):
-            text = self._read_text(path)
-            chunks = self._chunk_text(text)
-            if not chunks:
-                continue
-            files_indexed += 1
-            mtime = Path(path).stat().st_mtime
-            for idx, chunk in enumerate(chunks):
-                rows.append(
-                    {
-                        "id": f"{path}::{idx}",
-                        "path": path,
-                        "mtime": mtime,
-                        "chunk_index": idx,
-                        "snippet": chunk[:700],
-                        "embedding": self._embed(chunk),
-                    }
-                )
-            chunks_indexed += len(chunks)
-
-        with self.index_path.open("w", encoding="utf-8") as f:
-            for row in rows:
-                f.write(json.dumps(row, ensure_ascii=True) + "\n")
+        with index_tmp.open("w", encoding="utf-8") as f, embeddings_tmp.open("wb") as emb:
+            for file_rows, file_vectors in self._index_files(paths):
+                if not file_rows:
+                    continue
+                files_indexed += 1
+                chunks_indexed += len(file_rows)
+                for row in file_rows:
+                    f.write(json.dumps(row, ensure_ascii=True) + "\n")
+                file_vectors.tofile(emb)
+
+        # Drop the loaded index first: its matrix may be a memory map of the file about
+        # to be replaced (which Windows refuses while it is mapped).
+        self._index_data = None
+        os.replace(embeddings_tmp, self.embeddings_path)
+        os.replace(index_tmp, self.index_path)
 
         self._write_json(
             self.meta_path,
@@ -399,9 +703,13 @@ class RagService:
                 "roots": roots_to_use,
                 "files_indexed": files_indexed,
                 "chunks_indexed": chunks_indexed,
+                "embedding_dim": self.embedding_dim,
                 "indexed_at": utc_iso(),
             },
         )
+        self._clear_search_cache()
+        with self._cache_lock:
+            self._poll_cache.pop("index", None)
         return self.status()
 
     def _load_rows(self) -> list[dict]:
@@ -421,18 +729,163 @@ class RagService:
                     out.append(row)
         return out
 
+    def _load_embeddings(self, n_rows: int) -> np.ndarray | None:
+        """embeddings.f32 mapped read-only as (n_rows, dim), or None if it doesn't fit n_rows."""
+        dim = self._read_json(self.meta_path, {}).get("embedding_dim")
+        if not isinstance(dim, int) or dim <= 0 or not n_rows:
+            return None
+        try:
+            if self.embeddings_path.stat().st_size != n_rows * dim * 4:
+                return None
+            return np.memmap(self.embeddings_path, dtype=np.float32, mode="r", shape=(n_rows, dim))
+        except (OSError, ValueError):
+            return None
+
+    def _load_index(self) -> _IndexData | None:
+        try:
+            st = self.index_path.stat()
+        except OSError:
+            return None
+        try:
+            est = self.embeddings_path.stat()
+            stamp: tuple = (st.st_mtime_ns, st.st_size, est.st_mtime_ns, est.st_size)
+        except OSError:
+            stamp = (st.st_mtime_ns, st.st_size)
+        data = self._index_data
+        if data is not None and data.stamp == stamp:
+            return data
+
+        rows = self._load_rows()
+        stored = self._load_embeddings(len(rows))
+        paths: list[str] = []
+        snippets: list[str] = []
+        terms_list: list[dict] = []
+        # Per usable row: its inline embedding (indexes written before embeddings.f32)
+        # or its row number in the stored matrix.
+        embeddings: list[list | int] = []
+        for pos, row in enumerate(rows):
+            path = row.get("path")
+            emb = row.get("embedding")
+            snippet = row.get("snippet")
+            if not isinstance(emb, list):
+                emb = pos if stored is not None else None
+            if not isinstance(path, str) or emb is None or not isinstance(snippet, str):
+                continue
+            terms = row.get("terms")
+            if not isinstance(terms, dict):
+                # Index built before BM25 support: fall back to the stored snippet.
+                terms = Counter(_tokenize(snippet))
+            paths.append(path)
+            snippets.append(snippet)
+            terms_list.append(terms)
+            embeddings.append(emb)
+
+        dim = self.embedding_dim
+        if stored is not None and stored.shape[1] == dim and len(embeddings) == len(rows):
+            # Every row is in the file as written: use the mapping as it is.
+            matrix = stored
+        else:
+            # Rows from an index built with another embedding_dim are cut or zero-padded,
+            # which scores the same as a dot product over the common prefix.
+            matrix = np.zeros((len(embeddings), dim), dtype=np.float32)
+            for i, emb in enumerate(embeddings):
+                if isinstance(emb, int):
+                    emb = stored[emb]
+                n = min(len(emb), dim)
+                matrix[i, :n] = emb[:n]
+
+        data = _IndexData(stamp=stamp, paths=paths, snippets=snippets, terms=terms_list, matrix=matrix)
+        self._index_data = data
+        return data
+
     def status(self) -> dict:
-        meta = self._read_json(self.meta_path, {})
+        with self._cache_lock:
+            cached = self._poll_cache.get("index")
+        if cached is None:
+            cached = (self.index_path.exists(), self._read_json(self.meta_path, {}))
+            with self._cache_lock:
+                self._poll_cache["index"] = cached
+        index_exists, meta = cached
         return {
             "approved_roots": self._load_permissions(),
-            "index_exists": self.index_path.exists(),
-            "index_meta": meta,
+            "index_exists": index_exists,
+            "index_meta": copy.deepcopy(meta),
         }
 
-    def search(self, query: str, *, top_k: int = 5, roots: list[str] | None = None) -> list[RagHit]:
+    def _rows_under(self, index: _IndexData, roots: list[str]) -> np.ndarray:
+        """Index rows whose path is under one of roots, computed once per index and root set."""
+        prefixes = tuple(_root_prefixes(roots))
+        rows = index.rows_under.get(prefixes)
+        if rows is None:
+            rows = np.array([j for j, path in enumerate(index.paths) if _under_prefixes(path, prefixes)], dtype=np.intp)
+            if len(index.rows_under) >= _ROWS_UNDER_CACHE_SIZE:
+                index.rows_under.clear()
+            index.rows_under[prefixes] = rows
+        return rows
+
+    def _bm25_under(self, index: _IndexData, roots: list[str], rows: np.ndarray) -> tuple[_Bm25Postings, _Bm25View]:
+        """BM25 postings of the index and statistics of rows (those under roots), each built once."""
+        postings = index.bm25
+        if postings is None:
+            postings = index.bm25 = _bm25_postings(index.terms)
+        prefixes = tuple(_root_prefixes(roots))
+        view = index.bm25_under.get(prefixes)
+        if view is None:
+            view = _bm25_view(postings, rows)
+            if len(index.bm25_under) >= _ROWS_UNDER_CACHE_SIZE:
+                index.bm25_under.clear()
+            index.bm25_under[prefixes] = view
+        return postings, view
+
+    def search(
+        self,
+        query: str,
+        *,
+        top_k: int = 5,
+        roots: list[str] | None = None,
+        mode: RetrievalMode = "hybrid",
+        rerank: bool = False,
+        rerank_pool: int = 25,
+    ) -> list[RagHit]:
+        """
+        Top chunks for the query. "semantic" ranks by embedding similarity, "bm25" by
+        lexical BM25, and "hybrid" fuses the best max(top_k * 4, 40) of each with RRF
+        (the returned score is then the fused RRF score).
+
+        With rerank, the best rerank_pool candidates are rescored by the cross-encoder
+        (scores are then the reranker's); without FlashRank the ranking is kept as is.
+        Identical searches within the cache TTL are answered from memory.
+        """
+        if mode not in ("semantic", "bm25", "hybrid"):
+            raise ValueError(f"Unknown retrieval mode: {mode}")
         q = (query or "").strip()
         if not q:
             return []
+        if self._search_cache is None:
+            return self._search(q, top_k, roots, mode, rerank, rerank_pool)
+
+        # Stats permissions.json first: a revoked root (here or from another process)
+        # clears the cache before a stale hit can be served.
+        self._load_permissions()
+        key = (q, tuple(sorted(roots or ())), top_k, mode, rerank, rerank_pool)
+        with self._cache_lock:
+            cached = self._search_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        hits = self._search(q, top_k, roots, mode, rerank, rerank_pool)
+        with self._cache_lock:
+            self._search_cache[key] = tuple(hits)
+        return hits
+
+    def _search(
+        self,
+        q: str,
+        top_k: int,
+        roots: list[str] | None,
+        mode: RetrievalMode,
+        rerank: bool,
+        rerank_pool: int,
+    ) -> list[RagHit]:
 
         allowed = self._load_permissions()
         if roots:
@@ -446,28 +899,47 @@ class RagService:
         if not filtered_roots:
             return []
 
-        rows = self._load_rows()
-        if not rows:
+        index = self._load_index()
+        if index is None or not index.paths:
             return []
 
-        qvec = self._embed(q)
-        scored: list[RagHit] = []
-        for row in rows:
-            path = row.get("path")
-            emb = row.get("embedding")
-            snippet = row.get("snippet")
-            if not isinstance(path, str) or not isinstance(emb, list) or not isinstance(snippet, str):
-                continue
-            if not any(self._is_under_root(path, r) for r in filtered_roots):
-                continue
-            emb_f = [float(x) for x in emb]
-            score = _dot(qvec, emb_f)
-            if score <= 0:
-                continue
-            scored.append(RagHit(path=path, score=score, snippet=snippet))
+        # Rows under the requested roots; doc i below is index row allowed[i].
+        allowed = self._rows_under(index, filtered_roots)
+        if not len(allowed):
+            return []
+
+        limit = max(1, min(top_k, 12))
+        pool = max(limit * 4, 40)
+        # Dense candidates needed further down: the RRF pool, the rerank pool or the hits.
+        wanted = pool if mode == "hybrid" else max(limit, rerank_pool) if rerank else limit
+
+        dense: list[tuple[float, int]] = []
+        if mode != "bm25":
+            qvec = self._embed(q)
+            # One matrix-vector product scores every row at once.
+            scores = (index.matrix @ qvec)[allowed]
+            dense = [(float(scores[i]), int(i)) for i in _top_scores(scores, wanted)]
 
-        scored.sort(key=lambda x: x.score, reverse=True)
-        return scored[: max(1, min(top_k, 12))]
+        lexical: list[tuple[float, int]] = []
+        if mode != "semantic":
+            bm25 = _bm25_scores(_tokenize(q), *self._bm25_under(index, filtered_roots, allowed))
+            lexical = [(float(bm25[i]), int(i)) for i in np.flatnonzero(bm25 > 0)]
+
+        if mode == "hybrid":
+            ranked = _rrf_fuse(dense, heapq.nlargest(pool, lexical, key=itemgetter(0)))
+        else:
+            ranked = dense if mode == "semantic" else lexical
+
+        reranker = get_reranker(str(self.store_dir / "models")) if rerank and len(ranked) > 1 else None
+        # Only the hits (or the rerank pool) need ordering, not every scored row.
+        ranked = heapq.nlargest(max(limit, rerank_pool) if reranker is not None else limit, ranked, key=itemgetter(0))
+        if reranker is not None:
+            scores = reranker.score(q, [index.snippets[allowed[i]] for _, i in ranked])
+            ranked = sorted(zip(scores, (i for _, i in ranked)), key=itemgetter(0), reverse=True)
+        return [
+            RagHit(path=index.paths[allowed[i]], score=score, snippet=index.snippets[allowed[i]])
+            for score, i in ranked[:limit]
+        ]
 
     def find_files(
         self,
@@ -509,6 +981,16 @@ class RagService:
         if not q_tokens:
             return []
         q_compact = _compact(q)
+        compact_q_tokens = [_compact(t) for t in q_tokens]
+        # Candidate stage: a path can only score if one of the compact query tokens occurs
+        # in its compact form (a query token among the path's own tokens always does, and so
+        # does every token when q_compact does). One regex alternation rules out the rest in
+        # C before any per-path tokenizing. Underscore-only tokens compact to "" and would
+        # match anything, so they disable the filter.
+        candidate = None
+        if q_compact and all(compact_q_tokens):
+            alternation = "|".join(re.escape(t) for t in sorted(set(compact_q_tokens), key=len, reverse=True))
+            candidate = re.compile(alternation).search
         wants_images = any(w in q for w in ["photo", "photos", "picture", "pictures", "image", "images"])
         wants_docs = any(w in q for w in ["document", "documents", "pdf", "doc", "docx", "txt"])
 
@@ -516,12 +998,13 @@ class RagService:
         relaxed: list[RagHit] = []
         for path in self._iter_all_files(filtered_roots, max_files=max_files_scan):
             p = path.lower()
-            name = Path(path).name.lower()
-            ext = Path(path).suffix.lower()
-            path_tokens = set(_tokenize(p))
-            overlap = len(q_tokens & path_tokens)
             compact_path = _compact(p)
-            compact_overlap = sum(1 for tok in q_tokens if _compact(tok) and _compact(tok) in compact_path)
+            if candidate is not None and candidate(compact_path) is None:
+                continue
+            name = os.path.basename(p)
+            ext = _suffix(name)
+            overlap = len(q_tokens.intersection(_tokenize(p)))
+            compact_overlap = sum(1 for c in compact_q_tokens if c and c in compact_path)
             overlap_total = overlap + compact_overlap
             if overlap_total == 0 and q_compact and q_compact not in compact_path:
                 continue
@@ -546,8 +1029,67 @@ class RagService:
             else:
                 relaxed.append(hit)
 
-        scored.sort(key=lambda x: x.score, reverse=True)
-        if scored:
-            return scored[: max(1, min(top_k, 20))]
-        relaxed.sort(key=lambda x: x.score, reverse=True)
-        return relaxed[: max(1, min(top_k, 20))]
+        return heapq.nlargest(max(1, min(top_k, 20)), scored or relaxed, key=attrgetter("score"))
+
+
+class NullRagService(RagService):
+    """
+    Stand-in used when RAG is disabled (RAG_ENABLED=false): no approved roots,
+    no index and nothing written to disk. Reads come back empty; writes are
+    rejected the same way invalid input is (ValueError -> HTTP 400).
+    """
+
+    def __init__(self) -> None:
+        pass
+
+    def _disabled(self) -> ValueError:
+        return ValueError("Local file search is disabled (RAG_ENABLED=false)")
+
+    def list_permissions(self) -> list[str]:
+        return []
+
+    def list_available_drives(self) -> list[str]:
+        return []
+
+    def is_path_allowed(self, path: str) -> bool:
+        return False
+
+    def set_permissions(self, roots: list[str]) -> list[str]:
+        raise self._disabled()
+
+    def list_subdirs(self, path: str | None, *, limit: int = 300) -> list[str]:
+        raise self._disabled()
+
+    def grant_permission(self, path: str) -> list[str]:
+        raise self._disabled()
+
+    def revoke_permission(self, path: str) -> list[str]:
+        return []
+
+    def rebuild_index(self, *, roots: list[str] | None = None, max_files: int = 1500) -> dict:
+        raise self._disabled()
+
+    def status(self) -> dict:
+        return {"approved_roots": [], "index_exists": False, "index_meta": {}}
+
+    def search(
+        self,
+        query: str,
+        *,
+        top_k: int = 5,
+        roots: list[str] | None = None,
+        mode: RetrievalMode = "hybrid",
+        rerank: bool = False,
+        rerank_pool: int = 25,
+    ) -> list[RagHit]:
+        return []
+
+    def find_files(
+        self,
+        query: str,
+        *,
+        top_k: int = 8,
+        roots: list[str] | None = None,
+        max_files_scan: int = 450000,
+    ) -> list[RagHit]:
+        return []
@@ -1,11 +1,22 @@
 import json
+
+import orjson
 from sqlalchemy.orm import Session
 from ..domain.hashing import sha256_text, sha256_bytes
 from ..domain.enums import DraftStatus
 from ..storage.models import Approval, ToolPlan, Draft
 
+def canonical_json_bytes(obj) -> bytes:
+    """Compact, key-sorted UTF-8 JSON."""
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # Values orjson refuses (e.g. integers wider than 64 bits).
+        # Same raw-UTF-8 form as orjson, so a value's bytes do not depend on the path.
+        return json.dumps(obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+
 def canonical_json(obj) -> str:
-    return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+    return canonical_json_bytes(obj).decode("utf-8")
 
 class ApprovalService:
     def __init__(self, db: Session):
@@ -15,19 +26,21 @@ class ApprovalService:
         if draft.status != DraftStatus.drafting.value:
             raise ValueError("Draft is locked")
 
-        canon = canonical_json(tool_plan_obj)
-        h = sha256_bytes(canon.encode("utf-8"))
+        canon_bytes = canonical_json_bytes(tool_plan_obj)
+        canon = canon_bytes.decode("utf-8")
+        h = sha256_bytes(canon_bytes)
 
         if draft.tool_plan:
             draft.tool_plan.json_canonical = canon
             draft.tool_plan.content_hash = h
             tp = draft.tool_plan
         else:
-            tp = ToolPlan(draft_id=draft.id, json_canonical=canon, content_hash=h)
+            # Link via the relationship so a not-yet-flushed draft works too.
+            tp = ToolPlan(draft=draft, json_canonical=canon, content_hash=h)
             self.db.add(tp)
 
-        self.db.commit()
-        self.db.refresh(tp)
+        # Caller owns the transaction (chat() commits once per request).
+        self.db.flush()
         return tp
 
     def approve(self, draft: Draft) -> Approval:
@@ -1,17 +1,15 @@
+import inspect
 import json
 import time
 from datetime import datetime, timezone
 
 import anyio
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
-from ..domain.hashing import sha256_text
+from ..domain.hashing import sha256_bytes, text_hash_matches
 from ..storage.models import Approval, Draft, Execution
 from ..tools.registry import ToolRegistry
-
-
-def canonical_json(obj) -> str:
-    return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+from .approval_service import canonical_json, canonical_json_bytes
 
 
 def utc_iso() -> str:
@@ -24,24 +22,31 @@ class ExecutionService:
         self.tools = tools
 
     def _get_approval_and_draft(self, approval_id: str) -> tuple[Approval, Draft]:
-        approval = self.db.get(Approval, approval_id)
+        # Approval, draft and (Draft.tool_plan loads joined) tool plan in one SELECT.
+        approval = self.db.get(Approval, approval_id, options=[joinedload(Approval.draft)])
         if not approval:
             raise ValueError("Approval not found")
-        draft = self.db.get(Draft, approval.draft_id)
+        draft = approval.draft
         if not draft:
             raise ValueError("Draft not found")
         return approval, draft
 
-    def _is_tool_input_approved(self, draft: Draft, tool_name: str, tool_input: dict) -> bool:
+    def _is_tool_input_approved(
+        self, draft: Draft, tool_name: str, tool_input: dict, wanted: str | None = None
+    ) -> bool:
+        """wanted is canonical_json(tool_input) when the caller already has it."""
         if not draft.tool_plan:
             return tool_input == {}
 
         try:
+            # json, not orjson: orjson reads integers wider than 64 bits as floats,
+            # which would never match the canonical form of the same input.
             tool_plan_obj = json.loads(draft.tool_plan.json_canonical)
         except Exception:
             return False
 
-        wanted = canonical_json(tool_input)
+        if wanted is None:
+            wanted = canonical_json(tool_input)
         actions = tool_plan_obj.get("actions") if isinstance(tool_plan_obj, dict) else None
         if not isinstance(actions, list):
             return False
@@ -52,7 +57,8 @@ class ExecutionService:
             if action.get("tool") != tool_name:
                 continue
             params = action.get("params")
-            if isinstance(params, dict) and canonical_json(params) == wanted:
+            # Equal canonical JSON needs equal keys; only serialize params that have them.
+            if isinstance(params, dict) and params.keys() == tool_input.keys() and canonical_json(params) == wanted:
                 return True
         return False
 
@@ -101,34 +107,33 @@ class ExecutionService:
     ) -> Execution:
         approval, draft = self._get_approval_and_draft(approval_id)
 
-        if sha256_text(draft.content) != approval.draft_hash:
+        if not text_hash_matches(draft.content, approval.draft_hash):
             raise ValueError("Draft content changed since approval")
 
         current_tp_hash = draft.tool_plan.content_hash if draft.tool_plan else None
         if current_tp_hash != approval.toolplan_hash:
             raise ValueError("Tool plan changed since approval")
 
-        if not self._is_tool_input_approved(draft, tool_name, tool_input):
+        request_bytes = canonical_json_bytes(tool_input)
+        request_canonical = request_bytes.decode("utf-8")
+        if not self._is_tool_input_approved(draft, tool_name, tool_input, request_canonical):
             raise ValueError("Tool input not approved by locked tool plan")
 
         self._enforce_tool_policy(tool_name, tool_input, confirmation)
         tool = self.tools.get(tool_name)
         validated = tool.validate(tool_input)
 
-        request_canonical = canonical_json(tool_input)
         started_at = utc_iso()
         started_ns = time.perf_counter_ns()
 
         exe = Execution(
             approval_id=approval.id,
             tool_name=tool_name,
-            request_json=canonical_json(
-                {
-                    "tool_input": tool_input,
-                    "confirmation": confirmation,
-                    "tool_input_hash": sha256_text(request_canonical),
-                    "started_at": started_at,
-                }
+            # canonical_json of {confirmation, started_at, tool_input, tool_input_hash},
+            # with the already serialized tool input spliced in (keys in sorted order).
+            request_json=(
+                f'{{"confirmation":{canonical_json(confirmation)},"started_at":{json.dumps(started_at)},'
+                f'"tool_input":{request_canonical},"tool_input_hash":{json.dumps(sha256_bytes(request_bytes))}}}'
             ),
             status="RUNNING",
         )
@@ -137,7 +142,10 @@ class ExecutionService:
         self.db.refresh(exe)
 
         try:
-            result = await anyio.to_thread.run_sync(tool.run, validated)
+            if inspect.iscoroutinefunction(tool.run):
+                result = await tool.run(validated)
+            else:
+                result = await anyio.to_thread.run_sync(tool.run, validated)
             status = "SUCCEEDED"
             payload = {
                 "output": result,
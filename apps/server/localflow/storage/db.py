@@ -1,9 +1,51 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from ..core.config import settings
 
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(settings.database_url, echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
\ No newline at end of file
+# Sync drivers -> their asyncio counterparts (used by the async engine only).
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    u = make_url(url)
+    driver = _ASYNC_DRIVERS.get(u.drivername)
+    if driver:
+        u = u.set(drivername=driver)
+    return u.render_as_string(hide_password=False)
+
+# Shared by both engines: chat requests hold a connection only around their DB
+# reads/writes, so this comfortably covers concurrent users; stale connections
+# are checked on checkout and recycled before server-side idle timeouts.
+_POOL_OPTIONS = {
+    "pool_size": 20,
+    "max_overflow": 40,
+    "pool_timeout": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+engine = create_engine(settings.database_url, echo=False, future=True, **_POOL_OPTIONS)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+# Async engine for request handlers that must not block the event loop (e.g. /chat).
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    echo=False,
+    **_POOL_OPTIONS,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
@@ -0,0 +1,44 @@
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from localflow.core.config import settings
+from localflow.storage import models  # noqa: F401  (registers tables on Base.metadata)
+from localflow.storage.db import Base
+
+# Configured from [tool.alembic] in pyproject.toml (no alembic.ini / logging config).
+config = context.config
+
+# Same database as the app (DATABASE_URL / .env), not a URL duplicated in alembic config.
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        # SQLite can't ALTER most things in place; batch mode rebuilds tables instead.
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,90 @@
+"""baseline schema
+
+Revision ID: 0000_baseline
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+The schema shipped before migrations existed. A database that already has it
+(e.g. the bundled localflow.db) is adopted as-is; a fresh one gets the tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0000_baseline"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("conversations"):
+        return
+
+    op.create_table(
+        "conversations",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "messages",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("conversation_id", sa.String(36), sa.ForeignKey("conversations.id"), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_messages_conversation_id", "messages", ["conversation_id"])
+    op.create_table(
+        "drafts",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("conversation_id", sa.String(36), sa.ForeignKey("conversations.id"), nullable=False),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_drafts_conversation_id", "drafts", ["conversation_id"])
+    op.create_table(
+        "tool_plans",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("draft_id", sa.String(36), sa.ForeignKey("drafts.id"), nullable=False),
+        sa.Column("json_canonical", sa.Text(), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_tool_plans_draft_id", "tool_plans", ["draft_id"], unique=True)
+    op.create_table(
+        "approvals",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("draft_id", sa.String(36), sa.ForeignKey("drafts.id"), nullable=False),
+        sa.Column("draft_hash", sa.String(64), nullable=False),
+        sa.Column("toolplan_hash", sa.String(64), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_approvals_draft_id", "approvals", ["draft_id"])
+    op.create_table(
+        "executions",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("approval_id", sa.String(36), sa.ForeignKey("approvals.id"), nullable=False),
+        sa.Column("tool_name", sa.String(100), nullable=False),
+        sa.Column("request_json", sa.Text(), nullable=False),
+        sa.Column("result_json", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_executions_approval_id", "executions", ["approval_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("executions")
+    op.drop_table("approvals")
+    op.drop_table("tool_plans")
+    op.drop_table("drafts")
+    op.drop_table("messages")
+    op.drop_table("conversations")
@@ -0,0 +1,64 @@
+"""conversation summary columns
+
+Revision ID: 0001_conversation_summary
+Revises: 0000_baseline
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from localflow.domain.summaries import derive_title, preview
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_conversation_summary"
+down_revision: Union[str, None] = "0000_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("conversations") as batch:
+        batch.add_column(sa.Column("derived_title", sa.String(200), nullable=True))
+        batch.add_column(sa.Column("last_message_preview", sa.String(200), nullable=True))
+
+    # Backfill with the same helpers chat() uses when writing.
+    conn = op.get_bind()
+    conversations = sa.table(
+        "conversations",
+        sa.column("id", sa.String),
+        sa.column("derived_title", sa.String),
+        sa.column("last_message_preview", sa.String),
+    )
+    messages = sa.table(
+        "messages",
+        sa.column("conversation_id", sa.String),
+        sa.column("role", sa.String),
+        sa.column("content", sa.Text),
+        sa.column("created_at", sa.DateTime),
+    )
+    titles: dict[str, str] = {}
+    last: dict[str, str] = {}
+    rows = conn.execute(
+        sa.select(messages.c.conversation_id, messages.c.role, messages.c.content).order_by(messages.c.created_at)
+    )
+    for cid, role, content in rows:
+        last[cid] = content or ""
+        if cid not in titles and (role or "").lower() == "user":
+            title = derive_title(content)
+            if title:
+                titles[cid] = title
+    for cid in last.keys() | titles.keys():
+        conn.execute(
+            conversations.update()
+            .where(conversations.c.id == cid)
+            .values(derived_title=titles.get(cid), last_message_preview=preview(last.get(cid, "")))
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("conversations") as batch:
+        batch.drop_column("last_message_preview")
+        batch.drop_column("derived_title")
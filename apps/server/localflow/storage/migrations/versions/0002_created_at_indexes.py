@@ -0,0 +1,28 @@
+"""composite (parent, created_at) indexes
+
+Revision ID: 0002_created_at_indexes
+Revises: 0001_conversation_summary
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_created_at_indexes"
+down_revision: Union[str, None] = "0001_conversation_summary"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_messages_conversation_id_created_at", "messages", ["conversation_id", "created_at"])
+    op.create_index("ix_drafts_conversation_id_created_at", "drafts", ["conversation_id", "created_at"])
+    op.create_index("ix_executions_approval_id_created_at", "executions", ["approval_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_executions_approval_id_created_at", table_name="executions")
+    op.drop_index("ix_drafts_conversation_id_created_at", table_name="drafts")
+    op.drop_index("ix_messages_conversation_id_created_at", table_name="messages")
@@ -0,0 +1,36 @@
+"""approvals (draft_id, created_at) index; drop FK indexes covered by composites
+
+Revision ID: 0003_drop_redundant_fk_indexes
+Revises: 0002_created_at_indexes
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_drop_redundant_fk_indexes"
+down_revision: Union[str, None] = "0002_created_at_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Single-column FK index -> (table, column); each is the leading column of a composite.
+_COVERED = {
+    "ix_messages_conversation_id": ("messages", "conversation_id"),
+    "ix_drafts_conversation_id": ("drafts", "conversation_id"),
+    "ix_approvals_draft_id": ("approvals", "draft_id"),
+    "ix_executions_approval_id": ("executions", "approval_id"),
+}
+
+
+def upgrade() -> None:
+    op.create_index("ix_approvals_draft_id_created_at", "approvals", ["draft_id", "created_at"])
+    for name, (table, _) in _COVERED.items():
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, (table, column) in _COVERED.items():
+        op.create_index(name, table, [column])
+    op.drop_index("ix_approvals_draft_id_created_at", table_name="approvals")
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, DateTime, Text, ForeignKey
+from sqlalchemy import String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .db import Base
 from ..domain.enums import DraftStatus, ExecutionStatus
@@ -12,6 +12,9 @@ class Conversation(Base):
     __tablename__ = "conversations"
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title: Mapped[str] = mapped_column(String(200), default="New chat")
+    # Denormalized for the conversation list; maintained by chat() on write.
+    derived_title: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    last_message_preview: Mapped[str | None] = mapped_column(String(200), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
     messages: Mapped[list["Message"]] = relationship(back_populates="conversation", cascade="all, delete-orphan")
@@ -19,8 +22,11 @@ class Conversation(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    # History/list queries filter by conversation and order by time (either direction);
+    # the composite indexes also serve plain parent-id lookups, so the FKs get no own index.
+    __table_args__ = (Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),)
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    conversation_id: Mapped[str] = mapped_column(ForeignKey("conversations.id"), index=True)
+    conversation_id: Mapped[str] = mapped_column(ForeignKey("conversations.id"))
     role: Mapped[str] = mapped_column(String(20))  # "user" | "assistant"
     content: Mapped[str] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
@@ -29,8 +35,9 @@ class Message(Base):
 
 class Draft(Base):
     __tablename__ = "drafts"
+    __table_args__ = (Index("ix_drafts_conversation_id_created_at", "conversation_id", "created_at"),)
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    conversation_id: Mapped[str] = mapped_column(ForeignKey("conversations.id"), index=True)
+    conversation_id: Mapped[str] = mapped_column(ForeignKey("conversations.id"))
     type: Mapped[str] = mapped_column(String(50), default="assistant")
     title: Mapped[str] = mapped_column(String(200), default="")
     content: Mapped[str] = mapped_column(Text, default="")
@@ -44,7 +51,11 @@ class Draft(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
     conversation: Mapped["Conversation"] = relationship(back_populates="drafts")
-    tool_plan: Mapped["ToolPlan | None"] = relationship(back_populates="draft", uselist=False, cascade="all, delete-orphan")
+    # 1:1 and read whenever a draft is approved, executed or shown: load it in the same
+    # SELECT (LEFT OUTER JOIN) instead of a lazy second query.
+    tool_plan: Mapped["ToolPlan | None"] = relationship(
+        back_populates="draft", uselist=False, cascade="all, delete-orphan", lazy="joined"
+    )
     approvals: Mapped[list["Approval"]] = relationship(back_populates="draft", cascade="all, delete-orphan")
 
 class ToolPlan(Base):
@@ -60,8 +71,9 @@ class ToolPlan(Base):
 
 class Approval(Base):
     __tablename__ = "approvals"
+    __table_args__ = (Index("ix_approvals_draft_id_created_at", "draft_id", "created_at"),)
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    draft_id: Mapped[str] = mapped_column(ForeignKey("drafts.id"), index=True)
+    draft_id: Mapped[str] = mapped_column(ForeignKey("drafts.id"))
 
     draft_hash: Mapped[str] = mapped_column(String(64))
     toolplan_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
@@ -73,8 +85,9 @@ class Approval(Base):
 
 class Execution(Base):
     __tablename__ = "executions"
+    __table_args__ = (Index("ix_executions_approval_id_created_at", "approval_id", "created_at"),)
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    approval_id: Mapped[str] = mapped_column(ForeignKey("approvals.id"), index=True)
+    approval_id: Mapped[str] = mapped_column(ForeignKey("approvals.id"))
 
     tool_name: Mapped[str] = mapped_column(String(100))
     request_json: Mapped[str] = mapped_column(Text)  # canonical JSON
@@ -1,3 +1,5 @@
+import httpx
+
 from .browser_automation import BrowserAutomationTool
 from .browser_search import BrowserSearchTool
 from .open_links import OpenLinksTool
@@ -5,10 +7,10 @@ from .registry import ToolRegistry
 from .search_web import SearchWebTool
 
 
-def build_registry() -> ToolRegistry:
+def build_registry(http_client: httpx.AsyncClient | None = None) -> ToolRegistry:
     r = ToolRegistry()
     r.register(OpenLinksTool())
-    r.register(SearchWebTool())
+    r.register(SearchWebTool(http_client))
     r.register(BrowserSearchTool())
     r.register(BrowserAutomationTool())
     return r
@@ -0,0 +1,99 @@
+"""Warm Chromium shared by the Playwright tools.
+
+Playwright's sync API is bound to the thread that started it, while tool runs land
+on whichever anyio worker thread is free. So one daemon thread owns the driver and
+a launched browser per headless flag, and runs each job there in a fresh context:
+the browser stays warm across calls, cookies and storage do not carry over.
+Jobs run one at a time. A job that outlives its timeout retires that thread (it
+exits once the stuck page returns) and the next call starts a fresh one.
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import suppress
+from typing import Any, Callable
+
+_lock = threading.Lock()
+
+
+class _Worker:
+    def __init__(self) -> None:
+        self.jobs: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=_work, args=(self.jobs,), name="playwright", daemon=True)
+        self.thread.start()
+
+
+_current: _Worker | None = None
+
+
+def _work(jobs: queue.Queue) -> None:
+    playwright = None
+    browsers: dict[bool, Any] = {}
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        fn, headless, fut = job
+        if not fut.set_running_or_notify_cancel():
+            continue
+        try:
+            if playwright is None:
+                from playwright.sync_api import sync_playwright
+
+                playwright = sync_playwright().start()
+            browser = browsers.get(headless)
+            if browser is None or not browser.is_connected():
+                browser = browsers[headless] = playwright.chromium.launch(headless=headless)
+            context = browser.new_context()
+            try:
+                result = fn(context.new_page())
+            finally:
+                context.close()
+        except BaseException as e:
+            fut.set_exception(e)
+        else:
+            fut.set_result(result)
+
+    for browser in browsers.values():
+        with suppress(Exception):
+            browser.close()
+    if playwright is not None:
+        with suppress(Exception):
+            playwright.stop()
+
+
+@atexit.register
+def _shutdown() -> None:
+    worker = _current
+    if worker is not None and worker.thread.is_alive():
+        worker.jobs.put(None)
+        worker.thread.join(timeout=5)
+
+
+def run_in_browser(fn: Callable[[Any], Any], headless: bool = True, timeout: float | None = None) -> Any:
+    """
+    Run fn(page) on a new page of the warm browser and return its result.
+    Raises TimeoutError if it has not finished within `timeout` seconds.
+    """
+    global _current
+    with _lock:
+        worker = _current
+        if worker is None or not worker.thread.is_alive():
+            worker = _current = _Worker()
+    fut: Future = Future()
+    worker.jobs.put((fn, headless, fut))
+    try:
+        return fut.result(timeout=timeout)
+    except TimeoutError:
+        # Still queued: dropped, the worker skips it. Already running: the worker is
+        # stuck on this page, so later jobs go to a new one.
+        if not fut.cancel():
+            with _lock:
+                if _current is worker:
+                    _current = None
+            worker.jobs.put(None)
+        raise TimeoutError(f"Browser job did not finish within {timeout:g}s") from None
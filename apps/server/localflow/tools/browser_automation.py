@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Callable, Literal
 
 from pydantic import BaseModel, Field, HttpUrl, model_validator
 
+from ._browser_pool import run_in_browser
+
 
 class BrowserAction(BaseModel):
     id: str = Field(min_length=1, max_length=64)
@@ -31,13 +33,22 @@ class BrowserAutomationIn(BaseModel):
     dry_run: bool = True
 
 
+# One handler per BrowserAction.type, called as handler(page, action).
+_ACTION_HANDLERS: dict[str, Callable[[Any, BrowserAction], None]] = {
+    "goto": lambda page, a: page.goto(str(a.url), timeout=a.timeout_ms, wait_until="domcontentloaded"),
+    "click": lambda page, a: page.click(a.selector or "", timeout=a.timeout_ms),
+    "fill": lambda page, a: page.fill(a.selector or "", a.value or "", timeout=a.timeout_ms),
+    "press": lambda page, a: page.keyboard.press(a.value or ""),
+    "wait_for": lambda page, a: page.wait_for_selector(a.selector or "", timeout=a.timeout_ms),
+}
+
+
 class BrowserAutomationTool:
     name = "browser_automation"
     InputModel = BrowserAutomationIn
     risk = "HIGH"
 
-    def validate(self, data: dict) -> BrowserAutomationIn:
-        return self.InputModel.model_validate(data)
+    validate = staticmethod(BrowserAutomationIn.model_validate)
 
     def run(self, validated: BrowserAutomationIn) -> dict:
         if validated.dry_run:
@@ -48,33 +59,23 @@ class BrowserAutomationTool:
             }
 
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.sync_api  # noqa: F401
         except Exception as e:  # pragma: no cover
             raise RuntimeError("Playwright is not installed. Install 'playwright' and browser binaries.") from e
 
-        step_log: list[dict] = []
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=validated.headless)
-            page = browser.new_page()
-            try:
-                if validated.start_url:
-                    page.goto(str(validated.start_url), wait_until="domcontentloaded")
-                    step_log.append({"event": "start_url", "url": page.url})
-
-                for action in validated.actions:
-                    if action.type == "goto":
-                        page.goto(str(action.url), timeout=action.timeout_ms, wait_until="domcontentloaded")
-                    elif action.type == "click":
-                        page.click(action.selector or "", timeout=action.timeout_ms)
-                    elif action.type == "fill":
-                        page.fill(action.selector or "", action.value or "", timeout=action.timeout_ms)
-                    elif action.type == "press":
-                        page.keyboard.press(action.value or "")
-                    elif action.type == "wait_for":
-                        page.wait_for_selector(action.selector or "", timeout=action.timeout_ms)
-
-                    step_log.append({"id": action.id, "type": action.type, "url": page.url})
-
-                return {"dry_run": False, "final_url": page.url, "steps": step_log}
-            finally:
-                browser.close()
+        def run_actions(page) -> dict:
+            step_log: list[dict] = []
+            if validated.start_url:
+                page.goto(str(validated.start_url), wait_until="domcontentloaded")
+                step_log.append({"event": "start_url", "url": page.url})
+
+            for action in validated.actions:
+                _ACTION_HANDLERS[action.type](page, action)
+                step_log.append({"id": action.id, "type": action.type, "url": page.url})
+
+            return {"dry_run": False, "final_url": page.url, "steps": step_log}
+
+        # Every step's own timeout, plus Playwright's 30s default for the start_url
+        # navigation and some slack; a run past that is stuck.
+        timeout_s = sum(a.timeout_ms for a in validated.actions) / 1000 + 60.0
+        return run_in_browser(run_actions, headless=validated.headless, timeout=timeout_s)
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import re
 from urllib.parse import parse_qs, quote_plus, urljoin, urlparse
 
 from pydantic import BaseModel, Field
 
+from ._browser_pool import run_in_browser
+
+# Common imperative wrappers, removed so the search intent is cleaner.
+_QUERY_PREFIX_RE = re.compile(r"(?:please (?:open|find|search)|open|find|search|look up) ", re.IGNORECASE)
+
+# Upper bound for one search in the shared browser (goto alone defaults to 30s).
+_SEARCH_TIMEOUT_S = 60.0
+
 
 class BrowserSearchIn(BaseModel):
     query: str = Field(min_length=2, max_length=300)
@@ -16,27 +25,13 @@ class BrowserSearchTool:
     InputModel = BrowserSearchIn
     risk = "MEDIUM"
 
-    def validate(self, data: dict) -> BrowserSearchIn:
-        return self.InputModel.model_validate(data)
+    validate = staticmethod(BrowserSearchIn.model_validate)
 
     def _normalize_query(self, query: str) -> str:
         q = (query or "").strip()
-        # Remove common imperative wrappers so search intent is cleaner.
-        prefixes = [
-            "open ",
-            "find ",
-            "search ",
-            "look up ",
-            "please open ",
-            "please find ",
-            "please search ",
-        ]
-        lowered = q.lower()
-        for p in prefixes:
-            if lowered.startswith(p):
-                q = q[len(p):].strip()
-                lowered = q.lower()
-                break
+        m = _QUERY_PREFIX_RE.match(q)
+        if m:
+            q = q[m.end():].strip()
         q = q.replace("'s linkedin", " linkedin").replace(" profile", " ").strip()
         return " ".join(q.split())
 
@@ -56,7 +51,7 @@ class BrowserSearchTool:
 
     def run(self, validated: BrowserSearchIn) -> dict:
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.sync_api  # noqa: F401
         except Exception as e:  # pragma: no cover
             raise RuntimeError("Playwright is not installed. Install 'playwright' and browser binaries.") from e
 
@@ -70,31 +65,31 @@ class BrowserSearchTool:
             "&safe=active"
         )
 
+        def collect_anchors(page) -> list[list[str]]:
+            page.goto(query_url, wait_until="domcontentloaded")
+            # Every anchor's href and innerText in one round-trip to the browser,
+            # instead of two per anchor through element handles.
+            return page.eval_on_selector_all(
+                "a", "els => els.map(a => [a.getAttribute('href') || '', a.innerText || ''])"
+            )
+
         results: list[dict[str, str]] = []
         seen: set[str] = set()
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=validated.headless)
-            page = browser.new_page()
-            try:
-                page.goto(query_url, wait_until="domcontentloaded")
-                anchors = page.query_selector_all("a")
-                for anchor in anchors:
-                    href = anchor.get_attribute("href") or ""
-                    target = self._extract_target_url(href)
-                    if not target:
-                        continue
-                    if target in seen:
-                        continue
-                    host = (urlparse(target).hostname or "").lower()
-                    if host.endswith("google.com") or host.endswith("googleusercontent.com"):
-                        continue
-                    text = (anchor.inner_text() or "").strip()
-                    seen.add(target)
-                    results.append({"title": text or host or target, "url": target})
-                    if len(results) >= validated.max_results:
-                        break
-            finally:
-                browser.close()
+        anchors = run_in_browser(collect_anchors, headless=validated.headless, timeout=_SEARCH_TIMEOUT_S)
+        for href, anchor_text in anchors:
+            target = self._extract_target_url(href)
+            if not target:
+                continue
+            if target in seen:
+                continue
+            host = (urlparse(target).hostname or "").lower()
+            if host.endswith("google.com") or host.endswith("googleusercontent.com"):
+                continue
+            text = (anchor_text or "").strip()
+            seen.add(target)
+            results.append({"title": text or host or target, "url": target})
+            if len(results) >= validated.max_results:
+                break
 
         return {
             "query": validated.query,
@@ -1,6 +1,19 @@
+import os
+import shutil
+import subprocess
+import sys
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+
 from pydantic import BaseModel, Field, HttpUrl
 
+# The desktop's URL handler, launched directly and not waited on. None on Windows
+# (webbrowser uses os.startfile there) or when $BROWSER picks a specific browser.
+if os.environ.get("BROWSER") or sys.platform == "win32":
+    _OPENER = None
+else:
+    _OPENER = shutil.which("open" if sys.platform == "darwin" else "xdg-open")
+
 class OpenLinksIn(BaseModel):
     urls: list[HttpUrl] = Field(min_length=1, max_length=20)
 
@@ -9,12 +22,22 @@ class OpenLinksTool:
     InputModel = OpenLinksIn
     risk = "LOW"
 
-    def validate(self, data: dict) -> OpenLinksIn:
-        return self.InputModel.model_validate(data)
+    validate = staticmethod(OpenLinksIn.model_validate)
 
     def run(self, validated: OpenLinksIn) -> dict:
-        opened = []
-        for u in validated.urls:
-            webbrowser.open(str(u))
-            opened.append(str(u))
+        opened = [str(u) for u in validated.urls]
+        if _OPENER:
+            for url in opened:
+                subprocess.Popen(
+                    [_OPENER, url],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    close_fds=True,
+                    start_new_session=True,
+                )
+        else:
+            # Each open blocks on launching a browser helper process; launch them concurrently.
+            with ThreadPoolExecutor(max_workers=min(8, len(opened))) as ex:
+                list(ex.map(webbrowser.open, opened))
         return {"opened": opened}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Protocol, Any, Type
+from typing import Protocol, Any, Awaitable, Type
 from pydantic import BaseModel
 
 class Tool(Protocol):
@@ -7,7 +7,8 @@ class Tool(Protocol):
     risk: str  # "LOW" | "MEDIUM" | "HIGH"
 
     def validate(self, data: dict) -> BaseModel: ...
-    def run(self, validated: BaseModel) -> dict[str, Any]: ...
+    # Sync tools run on a worker thread; async ones are awaited on the event loop.
+    def run(self, validated: BaseModel) -> dict[str, Any] | Awaitable[dict[str, Any]]: ...
 
 class ToolRegistry:
     def __init__(self):
@@ -17,6 +18,7 @@ class ToolRegistry:
         self._tools[tool.name] = tool
 
     def get(self, name: str) -> Tool:
-        if name not in self._tools:
+        tool = self._tools.get(name)
+        if tool is None:
             raise ValueError(f"Unknown tool: {name}")
-        return self._tools[name]
\ No newline at end of file
+        return tool
\ No newline at end of file
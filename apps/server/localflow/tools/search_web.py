@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import re
 from typing import Any
-from urllib.parse import parse_qs, quote_plus, urlparse
+from urllib.parse import quote_plus, unquote_plus, urlparse
 
 import httpx
 from pydantic import BaseModel, Field
 
+# Google's redirect links (the whole quoted href), capturing the raw q= value: the
+# first parameter, ended by the next parameter, a fragment or the closing quote.
+_GOOGLE_LINK_RE = re.compile(r'href="/url\?q=([^&"#]*)[^"]*"')
+
 
 class SearchWebIn(BaseModel):
     query: str = Field(min_length=2, max_length=300)
@@ -19,8 +23,12 @@ class SearchWebTool:
     InputModel = SearchWebIn
     risk = "LOW"
 
-    def validate(self, data: dict) -> SearchWebIn:
-        return self.InputModel.model_validate(data)
+    validate = staticmethod(SearchWebIn.model_validate)
+
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        # The app's shared client (keep-alive pool, HTTP/2 when available); without
+        # one, each search opens and closes its own connection.
+        self._client = client
 
     def _domain_allowed(self, url: str, allowed_domains: list[str] | None) -> bool:
         if not allowed_domains:
@@ -36,12 +44,8 @@ class SearchWebTool:
     def _extract_google_links(self, html: str) -> list[str]:
         links: list[str] = []
         seen: set[str] = set()
-        for raw in re.findall(r'href="(/url\?q=[^"]+)"', html):
-            parsed = urlparse(raw)
-            q = parse_qs(parsed.query).get("q", [])
-            if not q:
-                continue
-            target = q[0]
+        for m in _GOOGLE_LINK_RE.finditer(html):
+            target = unquote_plus(m.group(1))
             if not target.startswith("http"):
                 continue
             if target in seen:
@@ -50,7 +54,7 @@ class SearchWebTool:
             links.append(target)
         return links
 
-    def run(self, validated: SearchWebIn) -> dict[str, Any]:
+    async def run(self, validated: SearchWebIn) -> dict[str, Any]:
         url = (
             "https://www.google.com/search"
             f"?q={quote_plus(validated.query)}"
@@ -66,7 +70,11 @@ class SearchWebTool:
                 "Chrome/122.0.0.0 Safari/537.36"
             )
         }
-        response = httpx.get(url, headers=headers, timeout=15.0)
+        if self._client is not None:
+            response = await self._client.get(url, headers=headers, timeout=15.0)
+        else:
+            async with httpx.AsyncClient(timeout=15.0) as client:
+                response = await client.get(url, headers=headers)
         response.raise_for_status()
         results: list[dict[str, str]] = []
         for link in self._extract_google_links(response.text):
@@ -1,6 +1,6 @@
 from types import SimpleNamespace
 
-from localflow.services.execution_service import ExecutionService
+from localflow.services.execution_service import ExecutionService, canonical_json
 
 
 def _draft_with_plan(plan_obj: dict):
@@ -69,3 +69,17 @@ def test_medium_high_policy_requires_confirmation_payload():
         assert False, "expected high risk allow flag requirement"
     except ValueError as e:
         assert "allow_high_risk" in str(e)
+
+
+def test_canonical_json_is_compact_and_key_sorted():
+    assert canonical_json({"b": [1, {"d": 2, "c": "é"}], "a": None}) == '{"a":null,"b":[1,{"c":"é","d":2}]}'
+    assert canonical_json({"n": 2**70}) == '{"n":1180591620717411303424}'
+    assert canonical_json({"n": 2**70, "s": "é"}) == '{"n":1180591620717411303424,"s":"é"}'
+
+
+def test_plan_with_wide_integer_round_trips_through_the_gate():
+    svc = ExecutionService(db=None, tools=None)  # type: ignore[arg-type]
+    params = {"n": 2**70}
+    plan = {"actions": [{"tool": "open_links", "params": params}]}
+    draft = SimpleNamespace(tool_plan=SimpleNamespace(json_canonical=canonical_json(plan)))
+    assert svc._is_tool_input_approved(draft, "open_links", params)
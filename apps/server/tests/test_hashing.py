@@ -0,0 +1,20 @@
+import hashlib
+
+from localflow.domain import hashing
+from localflow.domain.hashing import sha256_bytes, sha256_text, text_hash_matches
+
+
+def test_default_algorithm_is_sha256():
+    assert sha256_text("héllo") == hashlib.sha256("héllo".encode("utf-8")).hexdigest()
+    assert sha256_bytes(b"abc") == hashlib.sha256(b"abc").hexdigest()
+
+
+def test_long_text_is_hashed_piecewise_to_the_same_digest():
+    text = "é" * (hashing._TEXT_CHUNK * 2 + 7)
+    assert sha256_text(text) == hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def test_text_hash_matches():
+    digest = sha256_text("draft body")
+    assert text_hash_matches("draft body", digest)
+    assert not text_hash_matches("edited body", digest)
@@ -0,0 +1,69 @@
+import asyncio
+
+from localflow.llm.provider import CachedLLMProvider
+from localflow.llm.schemas import DraftOut, DraftResponse
+
+
+class CountingProvider:
+    _model = "fake"
+    deterministic = True
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_draft(self, user_message, history=None):
+        self.calls += 1
+        return DraftResponse(assistant_message=user_message, draft=DraftOut(content=f"reply {self.calls}"))
+
+
+def test_identical_prompt_is_served_from_cache():
+    inner = CountingProvider()
+    llm = CachedLLMProvider(inner)
+
+    async def run():
+        a = await llm.generate_draft("hello", history=[{"role": "user", "content": "x"}])
+        b = await llm.generate_draft("hello", history=[{"role": "user", "content": "x"}])
+        c = await llm.generate_draft("hello", history=[])
+        return a, b, c
+
+    a, b, c = asyncio.run(run())
+    assert inner.calls == 2
+    assert a.draft.content == b.draft.content == "reply 1"
+    assert c.draft.content == "reply 2"
+    assert (llm.hits, llm.misses) == (1, 2)
+
+
+def test_prompt_pack_change_misses_the_cache():
+    class Pack:
+        system = "v1"
+
+        def get_system(self):
+            return self.system
+
+        def get_repair(self):
+            return "repair"
+
+    inner = CountingProvider()
+    inner._pm = Pack()
+    llm = CachedLLMProvider(inner)
+
+    async def run():
+        a = await llm.generate_draft("hello")
+        inner._pm.system = "v2"
+        b = await llm.generate_draft("hello")
+        return a, b
+
+    a, b = asyncio.run(run())
+    assert (a.draft.content, b.draft.content) == ("reply 1", "reply 2")
+
+
+def test_sampling_provider_is_not_cached():
+    inner = CountingProvider()
+    inner.deterministic = False
+    llm = CachedLLMProvider(inner)
+
+    async def run():
+        return [await llm.generate_draft("hello") for _ in range(2)]
+
+    a, b = asyncio.run(run())
+    assert (a.draft.content, b.draft.content) == ("reply 1", "reply 2")
@@ -0,0 +1,40 @@
+import asyncio
+
+import httpx
+import orjson
+
+from localflow.llm._common import _extract_first_json_object
+from localflow.llm.ollama import OllamaProvider
+
+
+def test_extracts_first_balanced_object():
+    text = 'Sure! {"a": {"b": "x } y \\" {"}} and then {"c": 2}'
+    assert _extract_first_json_object(text) == '{"a": {"b": "x } y \\" {"}}'
+
+
+def test_unbalanced_object_is_not_extracted():
+    assert _extract_first_json_object('prefix {"a": 1') is None
+    assert _extract_first_json_object("no json here") is None
+
+
+def test_ollama_stream_stops_once_the_json_object_closes():
+    chunks = ['{"assistant_message": "hi {", ', r'"draft": {"content": "body \"}\" \\"}}', " and then", " more", " text"]
+    sent = []
+
+    async def stream():
+        for c in chunks:
+            sent.append(c)
+            yield orjson.dumps({"response": c, "done": False}) + b"\n"
+        yield orjson.dumps({"response": "", "done": True}) + b"\n"
+
+    def handler(request):
+        return httpx.Response(200, content=stream())
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = OllamaProvider(client, prompt_manager=None, base_url="http://ollama", model="m")
+            return await provider._raw_generate("prompt")
+
+    raw = asyncio.run(run())
+    assert raw == "".join(chunks[:2])
+    assert len(sent) == 2
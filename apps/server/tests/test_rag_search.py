@@ -0,0 +1,100 @@
+import sys
+import types
+from pathlib import Path
+
+from localflow.api.v1.rag import _etag_matches
+from localflow.rag import service as rag_service
+from localflow.rag import reranker
+from localflow.rag.service import RagService
+
+
+def _service(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "invoice.txt").write_text("quarterly invoice for the acme contract " * 3, encoding="utf-8")
+    (docs / "notes.txt").write_text("meeting notes about the contract renewal and budget", encoding="utf-8")
+    (docs / "travel.txt").write_text("travel plans budget hotel flights", encoding="utf-8")
+    rag = RagService(str(tmp_path / "store"))
+    rag.grant_permission(str(docs))
+    rag.rebuild_index()
+    return rag
+
+
+def test_search_modes_rank_the_keyword_match_first(tmp_path):
+    rag = _service(tmp_path)
+    for mode in ("semantic", "bm25", "hybrid"):
+        hits = rag.search("acme invoice", top_k=2, mode=mode)
+        assert hits and hits[0].path.endswith("invoice.txt"), mode
+
+
+def test_bm25_only_returns_lexical_matches(tmp_path):
+    rag = _service(tmp_path)
+    hits = rag.search("hotel", top_k=5, mode="bm25")
+    assert [Path(h.path).name for h in hits] == ["travel.txt"]
+
+
+def test_repeated_search_is_cached_until_reindex(tmp_path):
+    rag = _service(tmp_path)
+    first = rag.search("budget", top_k=3)
+    assert rag.search("budget", top_k=3) == first
+
+    (tmp_path / "docs" / "budget.txt").write_text("budget budget budget", encoding="utf-8")
+    assert rag.search("budget", top_k=3) == first
+    rag.rebuild_index()
+    assert Path(rag.search("budget", top_k=3, mode="bm25")[0].path).name == "budget.txt"
+
+
+def test_status_is_refreshed_by_reindex(tmp_path):
+    rag = _service(tmp_path)
+    assert rag.status()["index_meta"]["files_indexed"] == 3
+
+    (tmp_path / "docs" / "extra.txt").write_text("one more document", encoding="utf-8")
+    rag.rebuild_index()
+    assert rag.status()["index_meta"]["files_indexed"] == 4
+
+
+def test_permission_changes_from_another_instance_are_picked_up(tmp_path):
+    rag = _service(tmp_path)
+    assert rag.search("budget", top_k=3)
+
+    other = RagService(str(tmp_path / "store"))
+    other.revoke_permission(str(tmp_path / "docs"))
+    assert rag.search("budget", top_k=3) == []
+    assert rag.list_permissions() == []
+
+
+def test_process_pool_rebuild_writes_the_same_index(tmp_path, monkeypatch):
+    rag = _service(tmp_path)
+    serial = (rag.index_path.read_text(encoding="utf-8"), rag.embeddings_path.read_bytes())
+
+    monkeypatch.setattr(rag_service, "_INDEX_FILES_PER_WORKER", 1)
+    monkeypatch.setattr(rag_service.os, "cpu_count", lambda: 2)
+    rag.rebuild_index()
+    assert (rag.index_path.read_text(encoding="utf-8"), rag.embeddings_path.read_bytes()) == serial
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert _etag_matches('W/"abc"', 'W/"abc"')
+    assert _etag_matches('"xyz", "abc"', 'W/"abc"')
+    assert _etag_matches("*", 'W/"abc"')
+    assert not _etag_matches('W/"abd"', 'W/"abc"')
+    assert not _etag_matches(None, 'W/"abc"')
+
+
+def test_reranker_model_load_failure_disables_reranking(tmp_path, monkeypatch):
+    calls = []
+
+    def failing_ranker(**kwargs):
+        calls.append(kwargs)
+        raise OSError("offline")
+
+    monkeypatch.setitem(sys.modules, "flashrank", types.SimpleNamespace(Ranker=failing_ranker))
+    reranker.get_reranker.cache_clear()
+    try:
+        rag = _service(tmp_path)
+        assert rag.search("acme invoice", top_k=2, rerank=True)[0].path.endswith("invoice.txt")
+        assert rag.search("budget", top_k=2, rerank=True)
+        assert len(calls) == 1
+        assert calls[0]["cache_dir"] == str(rag.store_dir / "models")
+    finally:
+        reranker.get_reranker.cache_clear()
@@ -0,0 +1,9 @@
+from localflow.api.v1.chat import _fallback_tool_plan
+
+
+def test_fallback_search_url_is_sanitized_like_user_urls():
+    plan = _fallback_tool_plan("open john smith's linkedin profile.", "")
+    assert plan["actions"][1] == {
+        "tool": "open_links",
+        "params": {"urls": ["https://www.google.com/search?q=john+smith+linkedin+"]},
+    }